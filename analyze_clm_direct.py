@@ -6,44 +6,20 @@ Focus on the known working CLM to understand the pattern
 
 from web3 import Web3
 import json
-import requests
 from collections import defaultdict
+from janitor.clm_strategies import fetch_cow_vaults, resolve_strategies
+from janitor.http_client import RateLimitedClient
+from janitor.rpc import batch_eth_call, multicall_try_aggregate
 
 # Setup
 RPC = "https://arb-mainnet.g.alchemy.com/v2/5mlDO-31svMGY53J2Urqv"
-w3 = Web3(Web3.HTTPProvider(RPC))
+# Shared throttled/retrying session for web3 and raw HTTP calls
+CLIENT = RateLimitedClient()
+w3 = Web3(Web3.HTTPProvider(RPC, session=CLIENT))
 
 # Known working CLM that we already added
 WORKING_CLM = "0x33a8B05CAf2853D724c18432762A6B7EbC1DCBec"
-
-def get_arbiscan_transactions(address: str):
-    """Get transactions from Arbiscan API (free tier)"""
-    print(f"\n🔍 Fetching transactions from Arbiscan for {address[:10]}...")
-    
-    # Using Arbiscan API (you can get a free API key)
-    # For now using without API key (limited to 1 req/5 sec)
-    url = f"https://api.arbiscan.io/api"
-    params = {
-        'module': 'account',
-        'action': 'txlist',
-        'address': address,
-        'startblock': 0,
-        'endblock': 99999999,
-        'page': 1,
-        'offset': 100,
-        'sort': 'desc'
-    }
-    
-    try:
-        response = requests.get(url, params=params)
-        data = response.json()
-        
-        if data['status'] == '1' and data['result']:
-            return data['result']
-    except Exception as e:
-        print(f"  Error: {e}")
-    
-    return []
+BOT_ADDRESS = "0x00823727Ec5800ae6f5068fABAEb39608dE8bf45"
 
 def analyze_clm_patterns():
     """Analyze the known working CLM to understand patterns"""
@@ -57,33 +33,26 @@ def analyze_clm_patterns():
     # Get other top CLM strategies
     print("\n📋 Getting other CLM strategies...")
     
-    response = requests.get("https://api.beefy.finance/cow-vaults")
-    vaults = response.json()
+    vaults = fetch_cow_vaults(session=CLIENT)
     
-    # Get strategies
-    strategies = []
-    for vault in vaults:
+    # Get strategies - uncached strategy() reads go through one Multicall3 call
+    candidates = [
+        vault for vault in vaults
         if (vault.get('chain') == 'arbitrum' and 
             vault.get('status') == 'active' and
-            vault.get('earnContractAddress')):
-            
-            vault_addr = vault['earnContractAddress']
-            try:
-                # Try strategy()
-                result = w3.eth.call({
-                    'to': vault_addr,
-                    'data': '0xa8c62e76'
-                })
-                if result and len(result) == 32:
-                    strategy = "0x" + result.hex()[-40:]
-                    if strategy != "0x" + "0"*40:
-                        strategies.append({
-                            'vault_id': vault.get('id', ''),
-                            'strategy': Web3.to_checksum_address(strategy),
-                            'tvl': vault.get('tvl', 0)
-                        })
-            except:
-                pass
+            vault.get('earnContractAddress'))
+    ]
+    strategy_map = resolve_strategies(w3, [v['earnContractAddress'] for v in candidates])
+    
+    strategies = []
+    for vault in candidates:
+        strategy = strategy_map.get(vault['earnContractAddress'])
+        if strategy:
+            strategies.append({
+                'vault_id': vault.get('id', ''),
+                'strategy': strategy,
+                'tvl': vault.get('tvl', 0)
+            })
     
     # Sort by TVL
     strategies.sort(key=lambda x: x['tvl'], reverse=True)
@@ -94,66 +63,74 @@ def analyze_clm_patterns():
     print("\n🧪 Testing harvest() callability on top strategies...")
     
     harvestable = []
+    harvestable_addrs = set()
     
-    for i, strat in enumerate(strategies[:30]):
-        # Test harvest()
-        try:
-            result = w3.eth.call({
-                'from': "0x00823727Ec5800ae6f5068fABAEb39608dE8bf45",
-                'to': strat['strategy'],
-                'data': '0x4641257d'  # harvest()
-            })
-            
+    top_strategies = strategies[:30]
+    responses = batch_eth_call(RPC, [
+        {'from': BOT_ADDRESS, 'to': strat['strategy'], 'data': '0x4641257d'}  # harvest()
+        for strat in top_strategies
+    ], session=CLIENT)
+    
+    for strat, response in zip(top_strategies, responses):
+        if 'error' not in response:
             print(f"\n✅ {strat['vault_id'][:30]}")
             print(f"   Strategy: {strat['strategy']}")
             print(f"   TVL: ${strat['tvl']:,.0f}")
             print(f"   harvest() CALLABLE!")
             
             harvestable.append(strat)
-            
-        except Exception as e:
-            error = str(e)
-            if 'revert' not in error.lower():
-                # Function doesn't exist
-                continue
-            else:
-                # Function exists but reverted - might need params or permissions
-                print(f"\n🔒 {strat['vault_id'][:30]}")
-                print(f"   Strategy: {strat['strategy']}")
-                print(f"   harvest() exists but reverted: {error[:50]}")
+            harvestable_addrs.add(strat['strategy'])
+            continue
+        
+        error = str(response['error'].get('message', response['error']))
+        if 'revert' not in error.lower():
+            # Function doesn't exist
+            continue
+        # Function exists but reverted - might need params or permissions
+        print(f"\n🔒 {strat['vault_id'][:30]}")
+        print(f"   Strategy: {strat['strategy']}")
+        print(f"   harvest() exists but reverted: {error[:50]}")
     
     # Check alternative functions
     print("\n🔧 Testing alternative harvest functions...")
     
     alt_functions = [
-        ('compound()', '0xa0712d68'),
-        ('doHarvest()', '0x3e2d86d1'),
-        ('tend()', '0x440368a4'),
-        ('work()', '0xe26b013b'),
-        ('run()', '0xc0406226'),
+        (sig, bytes(Web3.keccak(text=sig)[:4]))
+        for sig in ("compound()", "doHarvest()", "tend()", "work()", "run()")
     ]
     
-    for func_name, selector in alt_functions:
+    # One Multicall3 tryAggregate per function across the strategies, so no
+    # contract is hit twice in an aggregate and a harvest by one probe can't
+    # put the next probe on cooldown. msg.sender is the multicall, which
+    # tests unauthenticated callability
+    alt_strategies = strategies[:20]
+    results = multicall_try_aggregate(w3, [
+        (strat['strategy'], selector)
+        for _, selector in alt_functions
+        for strat in alt_strategies
+    ], batch_size=len(alt_strategies))
+    
+    for f, (func_name, _) in enumerate(alt_functions):
         print(f"\nTesting {func_name}...")
         callable_count = 0
         
-        for strat in strategies[:20]:
-            try:
-                result = w3.eth.call({
-                    'from': "0x00823727Ec5800ae6f5068fABAEb39608dE8bf45",
-                    'to': strat['strategy'],
-                    'data': selector
-                })
-                callable_count += 1
-                print(f"  ✅ {strat['vault_id'][:20]} - CALLABLE")
-                
-                # Add to harvestable if not already there
-                if strat not in harvestable:
-                    strat['alt_function'] = func_name
-                    harvestable.append(strat)
-                    
-            except:
-                pass
+        outcomes = results[f * len(alt_strategies):(f + 1) * len(alt_strategies)]
+        if all(success is None for success, _ in outcomes):
+            print("  ❌ Probe failed (RPC error), results unknown")
+            continue
+        
+        for strat, (success, _) in zip(alt_strategies, outcomes):
+            if not success:
+                continue
+            
+            callable_count += 1
+            print(f"  ✅ {strat['vault_id'][:20]} - CALLABLE")
+            
+            # Add to harvestable if not already there
+            if strat['strategy'] not in harvestable_addrs:
+                strat['alt_function'] = func_name
+                harvestable.append(strat)
+                harvestable_addrs.add(strat['strategy'])
         
         if callable_count > 0:
             print(f"  Found {callable_count} strategies with callable {func_name}")
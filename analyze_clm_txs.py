@@ -6,49 +6,98 @@ Pull last N successful txs and build stats on selectors, callers, and cadence
 
 import json
 import time
-import requests
+import threading
 from web3 import Web3
-from typing import List, Dict, Set, Tuple
-from collections import defaultdict
+from typing import List, Dict, Set, Tuple, Optional
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import pairwise
+from statistics import fmean
 from datetime import datetime, timedelta
+from janitor.clm_strategies import fetch_cow_vaults, resolve_strategies
+from janitor.http_client import RateLimitedClient
+from janitor.rpc import batch_rpc
 
 # Configuration
 ARBITRUM_RPC = "https://arb-mainnet.g.alchemy.com/v2/5mlDO-31svMGY53J2Urqv"
-w3 = Web3(Web3.HTTPProvider(ARBITRUM_RPC))
+# Shared throttled/retrying session for web3 and raw HTTP calls
+CLIENT = RateLimitedClient()
+w3 = Web3(Web3.HTTPProvider(ARBITRUM_RPC, session=CLIENT))
+RPC_CONCURRENCY = 10  # Max JSON-RPC batches in flight per lookup
+ANALYSIS_WORKERS = 5  # Strategies analyzed in parallel, sized for the 500 RPS budget
+PRINT_LOCK = threading.Lock()
+# Keyed by raw 4-byte selector; hex is only produced for output
+SELECTOR_NAMES: Dict[bytes, str] = {
+    bytes(Web3.keccak(text=sig)[:4]): sig
+    for sig in ('harvest()', 'harvest(address)', 'harvest(address,uint256)',
+                'compound()', 'compound(address)', 'rebalance()', 'tend()', 'run()',
+                'execute()', 'report()', 'report(uint256)', 'work()', 'earn()',
+                'processRewards()', 'doHarvest()')
+}
+
+class TxRow:
+    """Projection of a tx + receipt keeping only what the analysis reads"""
+    __slots__ = ('hash', 'frm', 'selector', 'block', 'status', 'gas')
+    
+    def __init__(self, hash: str, frm: str, selector: Optional[bytes], block: int,
+                 status: int, gas: int):
+        self.hash = hash
+        self.frm = frm
+        self.selector = selector  # Truncated at insert so calldata isn't kept alive
+        self.block = block
+        self.status = status
+        self.gas = gas
 
 class CLMTransactionAnalyzer:
     """Deep analysis of CLM strategy transactions"""
     
     def __init__(self):
         self.w3 = w3
-        self.selector_names = {
-            '0x4641257d': 'harvest()',
-            '0x018ee9b7': 'harvest(address)',
-            '0x3208fab2': 'harvest(address,uint256)',
-            '0xa0712d68': 'compound()',
-            '0xf69e2046': 'compound(address)',
-            '0x7d7c8c1e': 'rebalance()',
-            '0x440368a4': 'tend()',
-            '0xc0406226': 'run()',
-            '0x61461954': 'execute()',
-            '0xc3f909d4': 'report()',
-            '0xe26b013b': 'work()',
-            '0xd389800f': 'earn()',
-            '0x845a4697': 'processRewards()',
-            '0x3e2d86d1': 'doHarvest()',
-            '0x99114df2': 'report(uint256)',
-        }
+        self.selector_names = SELECTOR_NAMES
+        # Contract-ness of an address doesn't change, so cache it for the run
+        self._is_contract_cache: Dict[str, bool] = {}
     
     def is_contract(self, address: str) -> bool:
         """Check if address is a contract"""
+        key = address.lower()
+        cached = self._is_contract_cache.get(key)
+        if cached is not None:
+            return cached
+        
         try:
-            code = self.w3.eth.get_code(address)
-            return len(code) > 2
+            code = self.w3.eth.get_code(Web3.to_checksum_address(address))
         except:
             return False
+        
+        self._is_contract_cache[key] = len(code) > 2
+        return self._is_contract_cache[key]
     
-    def get_recent_transactions(self, address: str, blocks_back: int = 50000) -> List[Dict]:
-        """Get recent transactions using eth_getLogs"""
+    def prefetch_is_contract(self, addresses: Set[str]):
+        """Populate the contract cache for unseen addresses with batched eth_getCode"""
+        pending = [addr for addr in addresses if addr not in self._is_contract_cache]
+        if not pending:
+            return
+        
+        responses = batch_rpc(ARBITRUM_RPC, [
+            ("eth_getCode", [addr, "latest"]) for addr in pending
+        ], session=CLIENT, max_workers=RPC_CONCURRENCY)
+        for addr, response in zip(pending, responses):
+            code = response.get('result')
+            if code is not None:
+                # Same rule as is_contract: more than 2 bytes of code
+                self._is_contract_cache[addr] = (len(code) - 2) // 2 > 2
+    
+    @staticmethod
+    def extract_selector(tx: Dict) -> Optional[bytes]:
+        """Raw 4-byte selector of a tx, or None for plain transfers"""
+        raw = tx.get('input', '')
+        if isinstance(raw, str):
+            return bytes.fromhex(raw[2:10]) if len(raw) >= 10 else None
+        return bytes(raw[:4]) if len(raw) >= 4 else None
+    
+    def get_recent_transactions(self, address: str, blocks_back: int = 50000,
+                                limit: int = 100) -> List[TxRow]:
+        """Get recent transactions using alchemy_getAssetTransfers"""
         print(f"\n📊 Fetching transactions for {address[:10]}...")
         
         current_block = self.w3.eth.block_number
@@ -64,84 +113,64 @@ class CLMTransactionAnalyzer:
                 "toBlock": hex(current_block),
                 "toAddress": address,
                 "category": ["external"],
-                "maxCount": "0x3e8"  # 1000 transactions
+                "withMetadata": True,
+                "excludeZeroValue": False,
+                "maxCount": hex(limit)  # Only request what we analyze
             }]
         }
         
         try:
-            response = requests.post(ARBITRUM_RPC, json=payload)
+            response = CLIENT.post(ARBITRUM_RPC, json=payload)
             result = response.json()
             
             if 'result' in result and 'transfers' in result['result']:
                 transfers = result['result']['transfers']
                 print(f"  Found {len(transfers)} transfers")
                 
-                # Get full transaction details for each
+                # Get full transaction details: tx + receipt per hash, all
+                # batches in flight at once (bounded to stay under CU/s limits)
+                hashes = [t['hash'] for t in transfers if t.get('hash')]
+                responses = batch_rpc(ARBITRUM_RPC, [
+                    call
+                    for h in hashes
+                    for call in (("eth_getTransactionByHash", [h]),
+                                 ("eth_getTransactionReceipt", [h]))
+                ], session=CLIENT, max_workers=RPC_CONCURRENCY)
+                
                 transactions = []
-                for transfer in transfers[:100]:  # Limit to 100 for speed
-                    tx_hash = transfer.get('hash')
-                    if tx_hash:
-                        try:
-                            tx = self.w3.eth.get_transaction(tx_hash)
-                            receipt = self.w3.eth.get_transaction_receipt(tx_hash)
-                            
-                            transactions.append({
-                                'hash': tx_hash,
-                                'from': tx['from'],
-                                'to': tx['to'],
-                                'input': tx['input'],
-                                'blockNumber': tx['blockNumber'],
-                                'status': receipt['status'],
-                                'gasUsed': receipt['gasUsed']
-                            })
-                        except:
-                            continue
+                for tx_hash, tx_resp, receipt_resp in zip(hashes, responses[0::2], responses[1::2]):
+                    tx = tx_resp.get('result')
+                    receipt = receipt_resp.get('result')
+                    if not tx or not receipt:
+                        continue
+                    
+                    transactions.append(TxRow(
+                        hash=tx_hash,
+                        frm=tx['from'],
+                        selector=self.extract_selector(tx),
+                        block=int(tx['blockNumber'], 16),
+                        status=int(receipt['status'], 16),
+                        gas=int(receipt['gasUsed'], 16)
+                    ))
                 
                 return transactions
         except Exception as e:
             print(f"  Error fetching transfers: {e}")
         
-        # Fallback: scan recent blocks
-        transactions = []
-        print(f"  Scanning blocks {start_block} to {current_block}...")
-        
-        # Sample blocks (every 1000th block)
-        for block_num in range(current_block, start_block, -1000):
-            try:
-                block = self.w3.eth.get_block(block_num, True)
-                
-                for tx in block.transactions:
-                    if tx.get('to') and tx['to'].lower() == address.lower():
-                        # Get receipt for status
-                        receipt = self.w3.eth.get_transaction_receipt(tx['hash'])
-                        
-                        transactions.append({
-                            'hash': tx['hash'].hex(),
-                            'from': tx['from'],
-                            'to': tx['to'], 
-                            'input': tx['input'],
-                            'blockNumber': block_num,
-                            'status': receipt['status'],
-                            'gasUsed': receipt['gasUsed']
-                        })
-                        
-                        if len(transactions) >= 100:
-                            return transactions
-            except:
-                continue
-        
-        return transactions
+        # No block-scan fallback: full blocks cost ~1MB and 26+ CU each, and
+        # throttling is already retried by the client
+        return []
     
     def analyze_strategy(self, address: str, vault_name: str = "") -> Dict:
         """Analyze a strategy's transaction patterns"""
-        print(f"\n{'='*60}")
-        print(f"Analyzing: {vault_name or address}")
-        
         # Get transactions
         txs = self.get_recent_transactions(address)
         
         if not txs:
-            print("  ❌ No transactions found")
+            with PRINT_LOCK:
+                print(f"\n{'='*60}")
+                print(f"Analyzing: {vault_name or address}")
+                print("  ❌ No transactions found")
             return {
                 'address': address,
                 'name': vault_name,
@@ -155,120 +184,113 @@ class CLMTransactionAnalyzer:
             }
         
         # Analyze transactions
-        selector_stats = defaultdict(lambda: {
-            'count': 0,
-            'success_count': 0,
-            'eoa_callers': set(),
-            'contract_callers': set(),
-            'gas_used': [],
-            'timestamps': []
-        })
+        # Per-selector aggregates: running counts/sums instead of per-tx lists
+        call_counts = Counter()
+        gas_sums = Counter()
+        eoa_by_selector = defaultdict(set)
+        contract_by_selector = defaultdict(set)
         
         all_eoa_callers = set()
         all_contract_callers = set()
         
-        for tx in txs:
-            # Skip failed transactions for selector analysis
-            if tx['status'] != 1:
-                continue
-                
-            # Extract selector
-            input_data = tx.get('input', '')
-            if len(input_data) < 10:
-                continue
-                
-            selector = input_data[:10]
-            caller = tx['from']
-            
-            # Check if caller is contract
-            is_caller_contract = self.is_contract(caller)
-            
+        # Successful txs with a selector (failed ones are skipped for selector analysis)
+        calls = [(tx.selector, tx) for tx in txs if tx.status == 1 and tx.selector]
+        
+        # Resolve every distinct caller up front instead of once per tx
+        self.prefetch_is_contract({tx.frm.lower() for _, tx in calls})
+        
+        for selector, tx in calls:
             # Update stats
-            stats = selector_stats[selector]
-            stats['count'] += 1
-            stats['success_count'] += 1
-            stats['gas_used'].append(tx['gasUsed'])
+            call_counts[selector] += 1
+            gas_sums[selector] += tx.gas
             
-            if is_caller_contract:
-                stats['contract_callers'].add(caller.lower())
-                all_contract_callers.add(caller.lower())
+            # Check if caller is contract
+            caller = tx.frm.lower()
+            if self.is_contract(caller):
+                contract_by_selector[selector].add(caller)
+                all_contract_callers.add(caller)
             else:
-                stats['eoa_callers'].add(caller.lower())
-                all_eoa_callers.add(caller.lower())
+                eoa_by_selector[selector].add(caller)
+                all_eoa_callers.add(caller)
         
         # Calculate publicness (based on unique EOA callers)
         publicness = self.calculate_publicness(len(all_eoa_callers))
         
-        # Find likely callable selectors
-        likely_callable = []
-        
-        print(f"\n📈 Transaction Analysis:")
-        print(f"  Total transactions: {len(txs)}")
-        print(f"  Successful: {sum(1 for tx in txs if tx['status'] == 1)}")
-        print(f"  Unique EOA callers: {len(all_eoa_callers)}")
-        print(f"  Unique contract callers: {len(all_contract_callers)}")
-        print(f"  Publicness score: {publicness:.1%}")
-        
-        if selector_stats:
-            print(f"\n🔧 Selector Analysis:")
+        # Report under a lock so concurrent analyses don't interleave
+        with PRINT_LOCK:
+            print(f"\n{'='*60}")
+            print(f"Analyzing: {vault_name or address}")
+            
+            # Find likely callable selectors
+            likely_callable = []
+            
+            print(f"\n📈 Transaction Analysis:")
+            print(f"  Total transactions: {len(txs)}")
+            print(f"  Successful: {sum(1 for tx in txs if tx.status == 1)}")
+            print(f"  Unique EOA callers: {len(all_eoa_callers)}")
+            print(f"  Unique contract callers: {len(all_contract_callers)}")
+            print(f"  Publicness score: {publicness:.1%}")
             
-            # Sort by frequency
-            sorted_selectors = sorted(
-                selector_stats.items(),
-                key=lambda x: x[1]['count'],
-                reverse=True
-            )
+            # JSON-friendly per-selector summary
+            selectors = {
+                '0x' + selector.hex(): {
+                    'count': count,
+                    'success_count': count,  # Only successful txs are aggregated
+                    'eoa_callers': sorted(eoa_by_selector[selector]),
+                    'contract_callers': sorted(contract_by_selector[selector]),
+                    'avg_gas': gas_sums[selector] / count
+                }
+                for selector, count in call_counts.items()
+            }
+            
+            if selectors:
+                print(f"\n🔧 Selector Analysis:")
             
-            for selector, stats in sorted_selectors[:5]:
-                func_name = self.selector_names.get(selector, "Unknown")
-                eoa_count = len(stats['eoa_callers'])
-                contract_count = len(stats['contract_callers'])
-                avg_gas = sum(stats['gas_used']) / len(stats['gas_used']) if stats['gas_used'] else 0
+                # Sort by frequency
+                for raw_selector, count in call_counts.most_common(5):
+                    selector = '0x' + raw_selector.hex()
+                    stats = selectors[selector]
+                    func_name = self.selector_names.get(raw_selector, "Unknown")
+                    eoa_count = len(stats['eoa_callers'])
+                    contract_count = len(stats['contract_callers'])
+                    avg_gas = stats['avg_gas']
                 
-                print(f"\n  {selector}: {func_name}")
-                print(f"    Calls: {stats['count']}")
-                print(f"    EOA callers: {eoa_count}")
-                print(f"    Contract callers: {contract_count}")
-                print(f"    Avg gas: {avg_gas:,.0f}")
+                    print(f"\n  {selector}: {func_name}")
+                    print(f"    Calls: {count}")
+                    print(f"    EOA callers: {eoa_count}")
+                    print(f"    Contract callers: {contract_count}")
+                    print(f"    Avg gas: {avg_gas:,.0f}")
                 
-                # Mark as likely callable if has multiple EOA callers
-                if eoa_count >= 2:
-                    likely_callable.append({
-                        'selector': selector,
-                        'name': func_name,
-                        'eoa_callers': eoa_count,
-                        'total_calls': stats['count']
-                    })
-                    print(f"    ✅ Likely callable!")
+                    # Mark as likely callable if has multiple EOA callers
+                    if eoa_count >= 2:
+                        likely_callable.append({
+                            'selector': selector,
+                            'name': func_name,
+                            'eoa_callers': eoa_count,
+                            'total_calls': count
+                        })
+                        print(f"    ✅ Likely callable!")
                 
-                # Show sample callers
-                if stats['eoa_callers']:
-                    sample_eoas = list(stats['eoa_callers'])[:2]
-                    print(f"    Sample EOAs: {', '.join(addr[:10] for addr in sample_eoas)}")
-        
-        # Calculate cadence (time between calls)
-        if len(txs) >= 2:
-            # Estimate based on block numbers
-            block_diffs = []
-            for i in range(1, len(txs)):
-                diff = abs(txs[i]['blockNumber'] - txs[i-1]['blockNumber'])
-                block_diffs.append(diff)
+                    # Show sample callers
+                    if stats['eoa_callers']:
+                        sample_eoas = stats['eoa_callers'][:2]
+                        print(f"    Sample EOAs: {', '.join(addr[:10] for addr in sample_eoas)}")
             
-            if block_diffs:
-                avg_blocks = sum(block_diffs) / len(block_diffs)
+            # Calculate cadence (time between calls)
+            if len(txs) >= 2:
+                # Estimate based on block numbers
+                avg_blocks = fmean(abs(b - a) for a, b in pairwise(tx.block for tx in txs))
                 # ~12 seconds per block on Arbitrum
                 cadence_hours = (avg_blocks * 12) / 3600
                 print(f"\n⏱️  Average cadence: {cadence_hours:.1f} hours between calls")
             else:
                 cadence_hours = None
-        else:
-            cadence_hours = None
-        
+            
         return {
             'address': address,
             'name': vault_name,
             'tx_count': len(txs),
-            'selectors': dict(selector_stats),
+            'selectors': selectors,
             'eoa_callers': list(all_eoa_callers)[:10],  # Sample
             'contract_callers': list(all_contract_callers)[:5],  # Sample
             'publicness': publicness,
@@ -293,36 +315,29 @@ def get_top_clm_strategies() -> List[Dict]:
     """Get top CLM strategies to analyze"""
     print("📋 Fetching top CLM vaults...")
     
-    response = requests.get("https://api.beefy.finance/cow-vaults")
-    vaults = response.json()
+    vaults = fetch_cow_vaults(session=CLIENT)
     
     # Filter for Arbitrum active CLM vaults
-    arb_clm = []
-    for vault in vaults:
+    candidates = [
+        vault for vault in vaults
         if (vault.get('chain') == 'arbitrum' and 
             vault.get('status') == 'active' and
-            vault.get('earnContractAddress')):
-            
-            # Try to get strategy address
-            vault_addr = vault['earnContractAddress']
-            try:
-                strategy_selector = "0xa8c62e76"  # strategy()
-                result = w3.eth.call({
-                    'to': vault_addr,
-                    'data': strategy_selector
-                })
-                
-                if result and len(result) == 32:
-                    strategy = "0x" + result.hex()[-40:]
-                    if strategy != "0x" + "0"*40:
-                        arb_clm.append({
-                            'id': vault.get('id', ''),
-                            'vault': vault_addr,
-                            'strategy': Web3.to_checksum_address(strategy),
-                            'tvl': vault.get('tvl', 0)
-                        })
-            except:
-                continue
+            vault.get('earnContractAddress'))
+    ]
+    
+    # Resolve strategy() for uncached vaults in a single Multicall3 round-trip
+    strategy_map = resolve_strategies(w3, [v['earnContractAddress'] for v in candidates])
+    
+    arb_clm = []
+    for vault in candidates:
+        strategy = strategy_map.get(vault['earnContractAddress'])
+        if strategy:
+            arb_clm.append({
+                'id': vault.get('id', ''),
+                'vault': vault['earnContractAddress'],
+                'strategy': strategy,
+                'tvl': vault.get('tvl', 0)
+            })
     
     # Sort by TVL
     arb_clm.sort(key=lambda x: x['tvl'], reverse=True)
@@ -339,17 +354,18 @@ def main():
     strategies = get_top_clm_strategies()
     print(f"\n✅ Found {len(strategies)} CLM strategies to analyze")
     
-    # Analyze each
+    # Analyze top 10 concurrently - each one is a chain of I/O-bound RPCs
     harvestable = []
     
-    for i, strat in enumerate(strategies[:10]):  # Analyze top 10
-        result = analyzer.analyze_strategy(
-            strat['strategy'],
-            strat['id']
+    with ThreadPoolExecutor(max_workers=ANALYSIS_WORKERS) as executor:
+        results = executor.map(
+            lambda strat: analyzer.analyze_strategy(strat['strategy'], strat['id']),
+            strategies[:10]
         )
         
-        if result['likely_callable']:
-            harvestable.append(result)
+        for result in results:
+            if result['likely_callable']:
+                harvestable.append(result)
     
     # Summary
     print("\n" + "="*60)
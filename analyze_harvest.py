@@ -8,6 +8,7 @@ from web3 import Web3
 from janitor.profit_tracker import ProfitTracker
 from janitor.rpc import RPCManager
 from janitor.config import load_config
+from janitor.prices import get_spot_usd
 
 def analyze_harvest(tx_hash: str = None):
     """Analyze a harvest transaction"""
@@ -45,7 +46,8 @@ def analyze_harvest(tx_hash: str = None):
     gas_used = tx_receipt['gasUsed']
     gas_price = tx_receipt.get('effectiveGasPrice', 0)
     gas_cost_eth = (gas_used * gas_price) / 1e18
-    gas_cost_usd = gas_cost_eth * 2500  # Approximate ETH price
+    prices = get_spot_usd(('ETH', 'WETH', 'BTC', 'WBTC'))
+    gas_cost_usd = gas_cost_eth * prices['ETH']
     
     print(f"⛽ Gas Usage:")
     print(f"   Gas Used: {gas_used:,} units")
@@ -64,12 +66,12 @@ def analyze_harvest(tx_hash: str = None):
         for reward in analysis['rewards']:
             print(f"   • {reward['amount']:.8f} {reward['symbol']}")
             print(f"     Token: {reward['token_address']}")
-            if reward['symbol'] in ['WETH', 'ETH']:
-                value_usd = reward['amount'] * 2500
-                print(f"     Value: ~${value_usd:.2f} @ $2500/ETH")
+            if reward['symbol'] in ('WETH', 'ETH'):
+                value_usd = reward['amount'] * prices['ETH']
+                print(f"     Value: ~${value_usd:.2f} @ ${prices['ETH']:,.0f}/ETH")
             elif reward['symbol'] == 'WBTC':
-                value_usd = reward['amount'] * 65000
-                print(f"     Value: ~${value_usd:.2f} @ $65000/BTC")
+                value_usd = reward['amount'] * prices['BTC']
+                print(f"     Value: ~${value_usd:.2f} @ ${prices['BTC']:,.0f}/BTC")
     else:
         print("   ⚠️  No ERC-20 transfers found to harvester address")
         print(f"   Harvester address checked: {harvester_address}")
@@ -91,11 +93,9 @@ def analyze_harvest(tx_hash: str = None):
     
     # Summary
     if analysis['rewards']:
-        total_value = sum([
-            r['amount'] * (2500 if r['symbol'] in ['WETH', 'ETH'] else 
-                          65000 if r['symbol'] == 'WBTC' else 0)
-            for r in analysis['rewards']
-        ])
+        total_value = sum(
+            r['amount'] * prices.get(r['symbol'], 0) for r in analysis['rewards']
+        )
         net_profit = total_value - gas_cost_usd
         print(f"📊 Summary:")
         print(f"   Estimated Reward Value: ${total_value:.2f}")
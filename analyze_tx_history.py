@@ -4,20 +4,53 @@ Analyze transaction history of CLM strategies to find actually called functions
 and determine publicness based on unique EOA callers.
 """
 
-import json
+import os
 import time
-import requests
+import threading
+from functools import cached_property
 from web3 import Web3
-from typing import List, Dict, Set, Optional
-from collections import defaultdict
+from typing import Callable, Iterable, List, Dict, Set, Optional, Tuple
+from collections import Counter
+from heapq import nlargest
+from operator import itemgetter
+from concurrent.futures import ThreadPoolExecutor
+from dotenv import load_dotenv
+from urllib3.util.retry import Retry
+from janitor import fast_json
+from janitor.beefy_api import BEEFY_API, iter_json_items
+from janitor.clm_strategies import decode_address
+from janitor.http_client import pooled_session
+from janitor.rpc import batch_rpc, multicall_try_aggregate
+
+load_dotenv()
 
 # Configuration
 ARBITRUM_RPC = "https://arb-mainnet.g.alchemy.com/v2/5mlDO-31svMGY53J2Urqv"
 BASE_RPC = "https://base-mainnet.g.alchemy.com/v2/3AvaLFHobnzEIToydrEiN"
 
+# One keep-alive pool for the explorer, Beefy API and RPC calls
+SESSION = pooled_session(16, 32, Retry(total=2, backoff_factor=0.2))
+RPC_CONCURRENCY = 5  # JSON-RPC batches in flight at once
+ANALYSIS_WORKERS = 5  # Strategies analyzed in parallel; explorer APIs allow 5 calls/s
+PRINT_LOCK = threading.Lock()
+STRATEGY_SELECTOR = bytes.fromhex('a8c62e76')  # strategy()
+
+# Harvest-like selectors keyed by raw 4 bytes, derived from the signatures
+# once at import; hex is only produced for output
+HARVEST_SELECTORS: Dict[bytes, str] = {
+    bytes(Web3.keccak(text=sig)[:4]): sig
+    for sig in ('harvest()', 'harvest(address)', 'compound()', 'tend()',
+                'rebalance()', 'report()', 'work()', 'earn()')
+}
+
 # Arbiscan/Basescan API endpoints
 ARBISCAN_API = "https://api.arbiscan.io/api"
 BASESCAN_API = "https://api.basescan.org/api"
+LOOKBACK_BLOCKS = 10000
+HEAD_BLOCK_TTL = 12  # Seconds; ~48 Arbitrum blocks, negligible against the lookback
+PUBLIC_EOA_COUNT = 10  # Unique EOA callers at which publicness saturates at 1.0
+
+TxMeta = Tuple[Optional[bytes], str]  # (selector, sender)
 
 class TxHistoryAnalyzer:
     """Analyzes transaction history to find callable functions"""
@@ -25,70 +58,165 @@ class TxHistoryAnalyzer:
     def __init__(self, chain: str = "arbitrum"):
         self.chain = chain
         if chain == "arbitrum":
-            self.w3 = Web3(Web3.HTTPProvider(ARBITRUM_RPC))
+            self.rpc_url = ARBITRUM_RPC
             self.api_url = ARBISCAN_API
+            self.api_key = os.getenv('ARBISCAN_API_KEY', '')
         else:
-            self.w3 = Web3(Web3.HTTPProvider(BASE_RPC))
+            self.rpc_url = BASE_RPC
             self.api_url = BASESCAN_API
+            self.api_key = os.getenv('BASESCAN_API_KEY', '')
+        self.session = SESSION
+        self._head_block: Optional[int] = None
+        self._head_ts = 0.0
+    
+    @cached_property
+    def w3(self) -> Web3:
+        """Provider for this chain, built on first use"""
+        return Web3(Web3.HTTPProvider(self.rpc_url, session=self.session))
     
-    def get_recent_transactions(self, address: str, limit: int = 100) -> List[Dict]:
-        """Get recent transactions to a contract"""
-        # Using direct RPC call to get recent transactions
+    def head_block(self) -> int:
+        """Latest block number, refreshed at most every HEAD_BLOCK_TTL seconds"""
+        if self._head_block is None or time.time() - self._head_ts > HEAD_BLOCK_TTL:
+            self._head_block = self.w3.eth.block_number
+            self._head_ts = time.time()
+        return self._head_block
+    
+    @staticmethod
+    def _tx_meta(tx: Dict) -> TxMeta:
+        """(selector, sender) - the only fields the analysis reads; calldata is dropped"""
+        selector = bytes.fromhex(tx['input'][2:10]) if len(tx['input']) >= 10 else None
+        return selector, tx['from']
+    
+    @staticmethod
+    def _take_until(rows: Iterable[TxMeta], taken: List[TxMeta],
+                    stop_predicate: Optional[Callable[[TxMeta], bool]]) -> bool:
+        """Append rows to taken, stopping after the first that satisfies stop_predicate"""
+        for row in rows:
+            taken.append(row)
+            if stop_predicate and stop_predicate(row):
+                return True
+        return False
+    
+    def get_recent_transactions(self, address: str, limit: int = 100,
+                                stop_predicate: Optional[Callable[[TxMeta], bool]] = None
+                                ) -> List[TxMeta]:
+        """Get recent transactions to a contract from the explorer's indexed txlist
+
+        stop_predicate is passed on to the eth_getLogs fallback, where returning
+        True skips the remaining lookups. The txlist arrives in one response,
+        so every row of it is kept.
+        """
         print(f"  Fetching recent transactions for {address[:10]}...")
         
-        current_block = self.w3.eth.block_number
-        start_block = max(0, current_block - 10000)  # Look back ~10k blocks
+        current_block = self.head_block()
+        start_block = max(0, current_block - LOOKBACK_BLOCKS)
         
-        transactions = []
+        try:
+            response = self.session.get(self.api_url, params={
+                'module': 'account',
+                'action': 'txlist',
+                'address': address,
+                'startblock': start_block,
+                'endblock': current_block,
+                'page': 1,
+                'offset': limit,
+                'sort': 'desc',
+                'apikey': self.api_key
+            }, timeout=20)
+            data = fast_json.loads(response.content)
+        except Exception as e:
+            print(f"  Error fetching txlist: {e}")
+            return self.get_transactions_from_logs(address, start_block, current_block, limit,
+                                                   stop_predicate)
         
-        # Get a sample of recent blocks and check for transactions
-        for block_num in range(current_block, start_block, -100):
-            try:
-                block = self.w3.eth.get_block(block_num, True)
-                for tx in block.transactions:
-                    if tx.get('to') and tx['to'].lower() == address.lower():
-                        transactions.append({
-                            'hash': tx['hash'].hex(),
-                            'from': tx['from'],
-                            'input': tx['input'],
-                            'blockNumber': block_num
-                        })
-                        if len(transactions) >= limit:
-                            return transactions
-            except:
-                continue
+        # status '0' covers both "No transactions found" and API errors
+        if data.get('status') != '1' or not isinstance(data.get('result'), list):
+            if data.get('message') == 'No transactions found':
+                return []
+            print(f"  Explorer API error: {data.get('result') or data.get('message')}")
+            return self.get_transactions_from_logs(address, start_block, current_block, limit,
+                                                   stop_predicate)
         
-        return transactions
+        # txlist also returns outgoing txs; keep only calls into the contract.
+        # Explorer and node JSON both return lowercase hex, so only the target
+        # needs normalising
+        target = address.lower()
+        return [self._tx_meta(tx) for tx in data['result'] if tx.get('to') == target]
     
-    def extract_function_selectors(self, transactions: List[Dict]) -> Dict[str, int]:
-        """Extract function selectors and count their usage"""
-        selector_counts = defaultdict(int)
+    def get_transactions_from_logs(self, address: str, start_block: int, current_block: int,
+                                   limit: int = 100,
+                                   stop_predicate: Optional[Callable[[TxMeta], bool]] = None
+                                   ) -> List[TxMeta]:
+        """Fallback when the explorer is unavailable: find txs via the contract's own logs
+
+        stop_predicate is called with each (selector, sender), newest first;
+        returning True ends the scan before the older lookups are sent.
+        """
+        print(f"  Falling back to eth_getLogs for {address[:10]}...")
         
-        for tx in transactions:
-            input_data = tx.get('input', '')
-            if len(input_data) >= 10:  # Has function selector
-                selector = input_data[:10]
-                selector_counts[selector] += 1
+        # Raw JSON-RPC rather than w3.eth.get_logs: skips web3's per-log
+        # AttributeDict/HexBytes formatting for fields we only compare as strings
+        (response,) = batch_rpc(self.rpc_url, [("eth_getLogs", [{
+            'address': address,
+            'fromBlock': hex(start_block),
+            'toBlock': hex(current_block)
+        }])], session=self.session)
+        if 'error' in response:
+            print(f"  Error fetching logs: {response['error']}")
+            return []
+        
+        # Newest first, one entry per tx
+        logs = response.get('result') or []
+        tx_hashes = list(dict.fromkeys(
+            log['transactionHash']
+            for log in sorted(logs, key=lambda log: int(log['blockNumber'], 16), reverse=True)
+        ))[:limit]
+        if not tx_hashes:
+            return []
+        
+        # Fetch newest first, one round of concurrent batches at a time, so an
+        # early stop skips the older lookups entirely
+        target = address.lower()
+        transactions = []
+        round_size = 10 * RPC_CONCURRENCY
+        for start in range(0, len(tx_hashes), round_size):
+            responses = batch_rpc(self.rpc_url, [
+                ("eth_getTransactionByHash", [tx_hash])
+                for tx_hash in tx_hashes[start:start + round_size]
+            ], session=self.session, max_workers=RPC_CONCURRENCY)
+            
+            # Logs also come from txs that reach the strategy via the vault; keep direct calls
+            if self._take_until((
+                self._tx_meta(tx)
+                for tx in (response.get('result') for response in responses)
+                if tx and tx.get('to') == target
+            ), transactions, stop_predicate):
+                break
         
-        return dict(selector_counts)
+        return transactions
     
-    def identify_unique_callers(self, transactions: List[Dict]) -> Set[str]:
-        """Identify unique EOA callers"""
-        callers = set()
+    def summarize_transactions(self, transactions: List[TxMeta]) -> Tuple[Counter, Set[str]]:
+        """Selector usage counts and distinct senders in a single pass"""
+        selector_counts = Counter()
+        senders = set()
         
-        for tx in transactions:
-            from_addr = tx.get('from', '')
-            if from_addr:
-                # Check if it's an EOA (not a contract)
-                code = self.w3.eth.get_code(from_addr)
-                if len(code) == 0:  # EOA has no code
-                    callers.add(from_addr.lower())
+        for selector, sender in transactions:
+            if selector:  # Has function selector
+                selector_counts[selector] += 1
+            if sender:
+                senders.add(sender.lower())
         
-        return callers
+        return selector_counts, senders
+    
+    def identify_unique_callers(self, unique_from: Set[str]) -> Set[str]:
+        """Identify unique EOA callers among lowercase sender addresses"""
+        # Only EOAs can originate a transaction, so every tx sender already is
+        # one - no eth_getCode needed
+        return set(unique_from)
     
     def calculate_publicness_score(self, unique_eoa_count: int) -> float:
         """Calculate publicness score based on unique EOA callers"""
-        if unique_eoa_count >= 10:
+        if unique_eoa_count >= PUBLIC_EOA_COUNT:
             return 1.0  # Highly public
         elif unique_eoa_count >= 5:
             return 0.7  # Moderately public  
@@ -99,13 +227,21 @@ class TxHistoryAnalyzer:
     
     def analyze_strategy(self, strategy_addr: str) -> Dict:
         """Analyze a strategy's transaction history"""
-        print(f"\n📊 Analyzing {strategy_addr}")
+        # Get recent transactions; the log fallback stops fetching once enough
+        # distinct callers have been seen to saturate the publicness score
+        seen_senders = set()
         
-        # Get recent transactions
-        txs = self.get_recent_transactions(strategy_addr, limit=50)
+        def publicness_saturated(tx: TxMeta) -> bool:
+            seen_senders.add(tx[1].lower())
+            return len(seen_senders) >= PUBLIC_EOA_COUNT
+        
+        txs = self.get_recent_transactions(strategy_addr, limit=50,
+                                           stop_predicate=publicness_saturated)
         
         if not txs:
-            print(f"  No recent transactions found")
+            with PRINT_LOCK:
+                print(f"\n📊 Analyzing {strategy_addr}")
+                print(f"  No recent transactions found")
             return {
                 'address': strategy_addr,
                 'tx_count': 0,
@@ -115,98 +251,77 @@ class TxHistoryAnalyzer:
                 'likely_harvestable': False
             }
         
-        # Extract function selectors
-        selectors = self.extract_function_selectors(txs)
+        # Extract function selectors and senders
+        selectors, senders = self.summarize_transactions(txs)
         
         # Identify unique callers
-        unique_callers = self.identify_unique_callers(txs)
+        unique_callers = self.identify_unique_callers(senders)
         
         # Calculate publicness
         publicness = self.calculate_publicness_score(len(unique_callers))
         
-        # Check for harvest-like selectors
-        harvest_selectors = {
-            '0x4641257d': 'harvest()',
-            '0x018ee9b7': 'harvest(address)',
-            '0xa0712d68': 'compound()',
-            '0x440368a4': 'tend()',
-            '0x7d7c8c1e': 'rebalance()',
-            '0xc3f909d4': 'report()',
-            '0xe26b013b': 'work()',
-            '0xd389800f': 'earn()'
-        }
-        
-        found_harvest = False
-        for selector in selectors:
-            if selector in harvest_selectors:
-                print(f"  ✅ Found {harvest_selectors[selector]} called {selectors[selector]} times")
-                found_harvest = True
-        
-        print(f"  📈 {len(txs)} recent transactions")
-        print(f"  👥 {len(unique_callers)} unique EOA callers")
-        print(f"  📊 Publicness score: {publicness:.1%}")
-        
-        # Show most called functions
-        if selectors:
-            print(f"  🔧 Most called selectors:")
-            sorted_selectors = sorted(selectors.items(), key=lambda x: x[1], reverse=True)
-            for sel, count in sorted_selectors[:3]:
-                print(f"     {sel}: {count} calls")
+        # Report under a lock so concurrent analyses don't interleave
+        with PRINT_LOCK:
+            print(f"\n📊 Analyzing {strategy_addr}")
+            
+            # Check for harvest-like selectors
+            found_harvest = False
+            for selector in selectors:
+                if selector in HARVEST_SELECTORS:
+                    print(f"  ✅ Found {HARVEST_SELECTORS[selector]} called {selectors[selector]} times")
+                    found_harvest = True
+            
+            print(f"  📈 {len(txs)} recent transactions")
+            print(f"  👥 {len(unique_callers)} unique EOA callers")
+            print(f"  📊 Publicness score: {publicness:.1%}")
+            
+            # Show most called functions
+            if selectors:
+                print(f"  🔧 Most called selectors:")
+                for sel, count in selectors.most_common(3):
+                    print(f"     0x{sel.hex()}: {count} calls")
         
         return {
             'address': strategy_addr,
             'tx_count': len(txs),
-            'selectors': selectors,
+            'selectors': {'0x' + sel.hex(): count for sel, count in selectors.items()},
             'unique_eoas': len(unique_callers),
             'publicness': publicness,
             'likely_harvestable': found_harvest or publicness > 0.4,
             'callers': list(unique_callers)[:5]  # Sample of callers
         }
 
-def get_top_clm_strategies(chain: str = "arbitrum", limit: int = 10) -> List[str]:
-    """Get top CLM strategy addresses to analyze"""
+def get_top_clm_strategies(analyzer: TxHistoryAnalyzer, limit: int = 10) -> List[Dict]:
+    """Get top CLM strategy addresses to analyze on the analyzer's chain"""
+    chain = analyzer.chain
     print(f"📋 Fetching top CLM vaults for {chain}...")
     
-    # Get CLM vaults from API
-    response = requests.get("https://api.beefy.finance/cow-vaults")
-    vaults = response.json()
-    
-    # Filter for chain
-    chain_vaults = [v for v in vaults if v.get('chain') == chain 
-                   and v.get('status') == 'active']
+    # Stream CLM vaults from API in one pass: filter for chain, project the
+    # fields used and keep only the top limit*2 by TVL (extra to account for failures)
+    top_vaults = nlargest(limit*2, (
+        {'id': v.get('id', ''), 'earnContractAddress': v.get('earnContractAddress'),
+         'tvl': v.get('tvl') or 0}
+        for v in iter_json_items(f"{BEEFY_API}/cow-vaults", session=SESSION)
+        if v.get('chain') == chain and v.get('status') == 'active'
+    ), key=itemgetter('tvl'))
     
-    # Sort by TVL
-    chain_vaults.sort(key=lambda x: x.get('tvl', 0), reverse=True)
+    # Get strategy addresses - one Multicall3 tryAggregate for all candidates
+    candidates = [v for v in top_vaults if v['earnContractAddress']]
+    results = multicall_try_aggregate(analyzer.w3, [
+        (vault['earnContractAddress'], STRATEGY_SELECTOR) for vault in candidates
+    ])
     
-    # Get strategy addresses
     strategies = []
-    w3 = Web3(Web3.HTTPProvider(ARBITRUM_RPC if chain == "arbitrum" else BASE_RPC))
-    
-    for vault in chain_vaults[:limit*2]:  # Get more to account for failures
-        vault_addr = vault.get('earnContractAddress')
-        if not vault_addr:
-            continue
-            
-        # Try to get strategy address
-        try:
-            strategy_selector = "0xa8c62e76"  # strategy()
-            result = w3.eth.call({
-                'to': vault_addr,
-                'data': strategy_selector
+    for vault, (success, data) in zip(candidates, results):
+        strategy = decode_address(data) if success else None
+        if strategy:
+            strategies.append({
+                'vault_id': vault.get('id', ''),
+                'strategy': strategy,
+                'tvl': vault.get('tvl', 0)
             })
-            
-            if result and len(result) == 32:
-                strategy = "0x" + result.hex()[-40:]
-                if strategy != "0x" + "0"*40:
-                    strategies.append({
-                        'vault_id': vault.get('id', ''),
-                        'strategy': Web3.to_checksum_address(strategy),
-                        'tvl': vault.get('tvl', 0)
-                    })
-                    if len(strategies) >= limit:
-                        break
-        except:
-            continue
+            if len(strategies) >= limit:
+                break
     
     return strategies
 
@@ -217,15 +332,21 @@ def main():
     
     # Analyze Arbitrum strategies
     analyzer = TxHistoryAnalyzer("arbitrum")
-    strategies = get_top_clm_strategies("arbitrum", limit=10)
+    strategies = get_top_clm_strategies(analyzer, limit=10)
     
     print(f"\n✅ Found {len(strategies)} strategies to analyze")
     
     harvestable = []
     
-    for strat_info in strategies:
-        result = analyzer.analyze_strategy(strat_info['strategy'])
-        
+    # Each analysis is a few independent network round-trips; run them
+    # concurrently (the analyzer's session and caches are shared)
+    with ThreadPoolExecutor(max_workers=ANALYSIS_WORKERS) as executor:
+        results = list(executor.map(
+            lambda strat_info: analyzer.analyze_strategy(strat_info['strategy']),
+            strategies
+        ))
+    
+    for strat_info, result in zip(strategies, results):
         if result['likely_harvestable']:
             harvestable.append({
                 **strat_info,
@@ -249,7 +370,7 @@ def main():
             
             # Show most called selector
             if h['selectors']:
-                top_sel = max(h['selectors'].items(), key=lambda x: x[1])
+                top_sel = Counter(h['selectors']).most_common(1)[0]
                 print(f"   Most called: {top_sel[0]} ({top_sel[1]} times)")
         
         # Save results
@@ -259,8 +380,7 @@ def main():
             'harvestable_strategies': harvestable
         }
         
-        with open('tx_history_analysis.json', 'w') as f:
-            json.dump(output, f, indent=2)
+        fast_json.dump_file(output, 'tx_history_analysis.json')
         
         print(f"\n💾 Saved analysis to tx_history_analysis.json")
     else:
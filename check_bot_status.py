@@ -7,6 +7,7 @@ import time
 from web3 import Web3
 from janitor.config import load_config
 from janitor.storage import Database
+from janitor.rpc import multicall_try_aggregate
 import os
 from dotenv import load_dotenv
 
@@ -58,23 +59,26 @@ strategies = [
     ("Beefy_tBTC_WBTC", "0xa2172783Eafd97FBF25bffFAFda3aD03B5115613")
 ]
 
-abi = [{'inputs': [], 'name': 'lastHarvest', 'outputs': [{'type': 'uint256'}], 'stateMutability': 'view', 'type': 'function'}]
+LAST_HARVEST = Web3.keccak(text="lastHarvest()")[:4]
 current_time = int(time.time())
 
-for name, addr in strategies:
-    try:
-        contract = w3.eth.contract(address=addr, abi=abi)
-        last_harvest = contract.functions.lastHarvest().call()
-        time_since = current_time - last_harvest
-        hours = time_since / 3600
-        
-        if hours >= 12:
-            print(f"  {name}: ✅ READY ({hours:.1f}h ago)")
-        else:
-            remaining = 12 - hours
-            print(f"  {name}: ⏰ {remaining:.1f}h remaining")
-    except Exception as e:
-        print(f"  {name}: ❌ Error: {e}")
+# All lastHarvest() reads in one Multicall3 call
+results = multicall_try_aggregate(w3, [(addr, LAST_HARVEST) for _, addr in strategies])
+
+for (name, addr), (success, ret) in zip(strategies, results):
+    if not success or len(ret) != 32:
+        print(f"  {name}: ❌ Error: lastHarvest() call failed")
+        continue
+    
+    last_harvest = int.from_bytes(ret, 'big')
+    time_since = current_time - last_harvest
+    hours = time_since / 3600
+    
+    if hours >= 12:
+        print(f"  {name}: ✅ READY ({hours:.1f}h ago)")
+    else:
+        remaining = 12 - hours
+        print(f"  {name}: ⏰ {remaining:.1f}h remaining")
 
 print("\n🤖 Bot should be:")
 print("  1. Polling every 5 seconds")
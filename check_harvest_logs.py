@@ -6,6 +6,13 @@ Deep dive into harvest transaction logs
 from web3 import Web3
 from janitor.rpc import RPCManager
 from janitor.config import load_config
+from hexbytes import HexBytes
+
+# Known event signatures and selectors, hashed once at import
+TRANSFER = Web3.keccak(text="Transfer(address,address,uint256)").hex()
+HARVEST = Web3.keccak(text="StratHarvest(address,uint256,uint256)").hex()
+REWARD_PAID = Web3.keccak(text="RewardPaid(address,uint256)").hex()
+HARVEST_WITH_RECIPIENT = bytes(Web3.keccak(text="harvest(address)")[:4])
 
 # Connect to Arbitrum
 config = load_config()
@@ -22,11 +29,6 @@ receipt = w3.eth.get_transaction_receipt(tx_hash)
 
 print(f"Transaction has {len(receipt.get('logs', []))} logs")
 
-# Known event signatures
-TRANSFER = Web3.keccak(text="Transfer(address,address,uint256)").hex()
-HARVEST = Web3.keccak(text="StratHarvest(address,uint256,uint256)").hex() 
-REWARD_PAID = Web3.keccak(text="RewardPaid(address,uint256)").hex()
-
 if not receipt.get('logs'):
     print("\n⚠️  No logs emitted - checking if this was a pure state change...")
     
@@ -37,18 +39,16 @@ if not receipt.get('logs'):
     print(f"  Input data length: {len(tx['input'])} bytes")
     
     # Decode the function selector
-    if len(tx['input']) >= 10:
-        selector = tx['input'][:10]
-        print(f"  Function selector: {selector}")
+    calldata = HexBytes(tx['input'])
+    if len(calldata) >= 4:
+        selector = calldata[:4]
+        print(f"  Function selector: 0x{selector.hex()}")
         
-        # harvest(address) selector
-        harvest_selector = "0x4641257d"  # harvest(address)
-        if selector.lower() == harvest_selector:
+        if selector == HARVEST_WITH_RECIPIENT:
             print(f"  ✅ Confirmed: harvest(address) was called")
-            if len(tx['input']) >= 74:  # 10 (selector) + 64 (address param)
-                param_raw = tx['input'][10:74]
-                # Remove leading zeros and add 0x prefix
-                param_address = '0x' + param_raw[-40:]
+            if len(calldata) >= 36:  # 4 (selector) + 32 (address param)
+                # Address is the low 20 bytes of the first word
+                param_address = '0x' + calldata[16:36].hex()
                 print(f"  Parameter (callFeeRecipient): {Web3.to_checksum_address(param_address)}")
 else:
     print("\nLogs found - but transaction receipt shows 0 logs. This might be an RPC issue.")
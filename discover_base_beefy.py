@@ -4,13 +4,24 @@ Discover standard Beefy vaults on Base network (non-CLM)
 """
 
 from web3 import Web3
-import json
-import requests
+from heapq import nlargest
+from operator import itemgetter
+from urllib3.util.retry import Retry
+from janitor import fast_json
+from janitor.beefy_api import BEEFY_API, iter_json_items
+from janitor.http_client import pooled_session
+from janitor.rpc import batch_eth_call, eth_call_outcome
 
 # Setup
 BASE_RPC = "https://base-mainnet.g.alchemy.com/v2/3AvaLFHobnzEIToydrEiN"
-w3 = Web3(Web3.HTTPProvider(BASE_RPC))
+# One keep-alive pool for the Beefy API and RPC calls
+SESSION = pooled_session(16, 32, Retry(total=2, backoff_factor=0.2))
+w3 = Web3(Web3.HTTPProvider(BASE_RPC, session=SESSION))
 BOT_ADDRESS = "0x00823727Ec5800ae6f5068fABAEb39608dE8bf45"
+HARVEST_WITH_RECIPIENT = bytes(Web3.keccak(text="harvest(address)")[:4])
+HARVEST_NO_PARAMS = bytes(Web3.keccak(text="harvest()")[:4])
+COOLDOWN_REVERT = bytes.fromhex('26c87876')  # Custom error raised while on cooldown
+RPC_CONCURRENCY = 4  # JSON-RPC batches in flight at once
 
 def discover_base_beefy():
     """Discover standard Beefy vaults on Base"""
@@ -28,30 +39,32 @@ def discover_base_beefy():
     
     # Get Base vaults from Beefy API
     print("\n📋 Fetching Base Beefy vaults...")
-    response = requests.get("https://api.beefy.finance/vaults")
-    all_vaults = response.json()
-    
-    # Filter for Base standard vaults (not CLM)
-    base_vaults = []
-    for vault in all_vaults:
-        if (vault.get('chain') == 'base' and 
-            vault.get('status') == 'active' and
-            vault.get('strategy') and
-            'cow' not in vault.get('id', '').lower()):  # Exclude CLM vaults
-            
-            base_vaults.append({
-                'id': vault.get('id', ''),
-                'strategy': vault['strategy'],
-                'tvl': vault.get('tvl', 0),
-                'apy': vault.get('apy', 0),
-                'platform': vault.get('platformId', ''),
-                'earnContractAddress': vault.get('earnContractAddress', '')
-            })
     
-    # Sort by TVL
-    base_vaults.sort(key=lambda x: x['tvl'], reverse=True)
+    # Stream and filter for Base standard vaults (not CLM)
+    total_vaults = 0
+    
+    def base_standard_vaults():
+        nonlocal total_vaults
+        for vault in iter_json_items(f"{BEEFY_API}/vaults", session=SESSION):
+            if (vault.get('chain') == 'base' and 
+                vault.get('status') == 'active' and
+                vault.get('strategy') and
+                'cow' not in vault.get('id', '').lower()):  # Exclude CLM vaults
+                
+                total_vaults += 1
+                yield {
+                    'id': vault.get('id', ''),
+                    'strategy': vault['strategy'],
+                    'tvl': vault.get('tvl') or 0,
+                    'apy': vault.get('apy', 0),
+                    'platform': vault.get('platformId', ''),
+                    'earnContractAddress': vault.get('earnContractAddress', '')
+                }
+    
+    # Only the top 30 by TVL are ever probed, so keep just those
+    base_vaults = nlargest(30, base_standard_vaults(), key=itemgetter('tvl'))
     
-    print(f"Found {len(base_vaults)} standard Beefy vaults on Base")
+    print(f"Found {total_vaults} standard Beefy vaults on Base")
     
     if not base_vaults:
         print("❌ No standard Beefy vaults found on Base")
@@ -70,58 +83,45 @@ def discover_base_beefy():
     print("\n🧪 Testing harvest(address) callability...")
     harvestable = []
     
-    for vault in base_vaults[:30]:  # Test top 30
-        strategy_addr = vault['strategy']
-        
-        # Test harvest(address) - standard Beefy pattern
-        try:
-            # Encode harvest(address) call
-            # Function selector for harvest(address): 0x018ee9b7
-            call_data = '0x018ee9b7' + BOT_ADDRESS[2:].lower().zfill(64)
-            
-            result = w3.eth.call({
-                'from': BOT_ADDRESS,
-                'to': strategy_addr,
-                'data': call_data
-            })
-            
+    # Probe the top 30 as JSON-RPC eth_call batches from the bot, so each
+    # simulation gets its own gas budget and msg.sender is the real caller;
+    # reverts keep their data so cooldowns are still recognisable
+    call_data = '0x' + HARVEST_WITH_RECIPIENT.hex() + BOT_ADDRESS[2:].lower().zfill(64)
+    results = [eth_call_outcome(response) for response in batch_eth_call(BASE_RPC, [
+        {'from': BOT_ADDRESS, 'to': vault['strategy'], 'data': call_data} for vault in base_vaults
+    ], session=SESSION, max_workers=RPC_CONCURRENCY)]
+    
+    for vault, (status, return_data) in zip(base_vaults, results):
+        if status == 'ok':
             print(f"\n✅ {vault['id'][:40]}")
-            print(f"   Strategy: {strategy_addr}")
+            print(f"   Strategy: {vault['strategy']}")
             print(f"   TVL: ${vault['tvl']:,.0f}")
             print(f"   harvest(address) CALLABLE!")
             
             harvestable.append(vault)
-            
-        except Exception as e:
-            error = str(e)
-            # Check if it's just a cooldown error (common)
-            if '0x26c87876' in error:
-                print(f"\n⏰ {vault['id'][:40]} - On cooldown but likely harvestable")
-                harvestable.append(vault)
-            elif 'revert' in error.lower():
-                # Function exists but reverted for other reason
-                pass
+        elif status == 'reverted' and return_data[:4] == COOLDOWN_REVERT:
+            # Just a cooldown error (common)
+            print(f"\n⏰ {vault['id'][:40]} - On cooldown but likely harvestable")
+            harvestable.append(vault)
+        elif status == 'failed':
+            print(f"\n⚠️ {vault['id'][:40]} - harvest(address) probe failed (RPC error)")
     
     # Also test harvest() without params
     if len(harvestable) < 5:
         print("\n🔧 Testing harvest() without params...")
         
-        for vault in base_vaults[:20]:
-            if vault in harvestable:
-                continue
-                
-            try:
-                result = w3.eth.call({
-                    'from': BOT_ADDRESS,
-                    'to': vault['strategy'],
-                    'data': '0x4641257d'  # harvest()
-                })
-                
+        harvestable_addrs = {vault['strategy'] for vault in harvestable}
+        remaining = [vault for vault in base_vaults[:20] if vault['strategy'] not in harvestable_addrs]
+        results = [eth_call_outcome(response) for response in batch_eth_call(BASE_RPC, [
+            {'from': BOT_ADDRESS, 'to': vault['strategy'], 'data': '0x' + HARVEST_NO_PARAMS.hex()}
+            for vault in remaining
+        ], session=SESSION, max_workers=RPC_CONCURRENCY)]
+        
+        for vault, (status, _) in zip(remaining, results):
+            if status == 'ok':
                 print(f"  ✅ {vault['id'][:40]} - harvest() CALLABLE")
                 vault['no_params'] = True
                 harvestable.append(vault)
-            except:
-                pass
     
     # Summary
     print("\n" + "="*60)
@@ -129,7 +129,7 @@ def discover_base_beefy():
     print("="*60)
     
     print(f"\n📊 Statistics:")
-    print(f"  Total standard vaults: {len(base_vaults)}")
+    print(f"  Total standard vaults: {total_vaults}")
     print(f"  Harvestable: {len(harvestable)}")
     
     if harvestable:
@@ -176,12 +176,11 @@ def discover_base_beefy():
             print(f"   Params: {params}")
         
         # Save results
-        with open('base_beefy_harvestable.json', 'w') as f:
-            json.dump({
-                'chain': 'base',
-                'found': len(harvestable),
-                'targets': targets
-            }, f, indent=2)
+        fast_json.dump_file({
+            'chain': 'base',
+            'found': len(harvestable),
+            'targets': targets
+        }, 'base_beefy_harvestable.json')
         
         print(f"\n💾 Saved {len(targets)} Base Beefy targets to base_beefy_harvestable.json")
         
@@ -4,13 +4,29 @@ Discover Base network CLM vaults using the same approach that worked for Arbitru
 """
 
 from web3 import Web3
-import json
-import requests
+from concurrent.futures import ThreadPoolExecutor
+from urllib3.util.retry import Retry
+from janitor import fast_json
+from janitor.beefy_api import get_json
+from janitor.clm_strategies import decode_address
+from janitor.http_client import pooled_session
+from janitor.rpc import batch_eth_call, eth_call_outcome, multicall_try_aggregate
 
 # Setup
 BASE_RPC = "https://base-mainnet.g.alchemy.com/v2/3AvaLFHobnzEIToydrEiN"
-w3 = Web3(Web3.HTTPProvider(BASE_RPC))
+# One keep-alive pool for the Beefy API and RPC calls
+SESSION = pooled_session(10, 20, Retry(total=3, backoff_factor=0.3))
+w3 = Web3(Web3.HTTPProvider(BASE_RPC, session=SESSION))
 BOT_ADDRESS = "0x00823727Ec5800ae6f5068fABAEb39608dE8bf45"
+STRATEGY_SELECTOR = bytes(Web3.keccak(text="strategy()")[:4])
+MANAGER_SELECTOR = bytes(Web3.keccak(text="manager()")[:4])
+# harvest() first, then the alternatives in the order they're preferred
+HARVEST_FUNCTIONS = [
+    (sig, bytes(Web3.keccak(text=sig)[:4]))
+    for sig in ("harvest()", "compound()", "tend()", "work()")
+]
+COOLDOWN_REVERT = bytes.fromhex('26c87876')  # Custom error raised while on cooldown
+RPC_CONCURRENCY = 4  # JSON-RPC batches in flight at once
 
 def discover_base_clm():
     """Discover harvestable CLM vaults on Base"""
@@ -18,6 +34,11 @@ def discover_base_clm():
     print("DISCOVERING BASE NETWORK CLM VAULTS")
     print("="*60)
     
+    # Download the vault list in the background while the RPC round-trips run
+    executor = ThreadPoolExecutor(max_workers=1)
+    cow_vaults = executor.submit(get_json, '/cow-vaults', session=SESSION)
+    executor.shutdown(wait=False)
+    
     # Check connection
     if not w3.is_connected():
         print("❌ Failed to connect to Base RPC")
@@ -28,59 +49,54 @@ def discover_base_clm():
     
     # Get Base CLM vaults
     print("\n📋 Fetching Base CLM vaults...")
-    response = requests.get("https://api.beefy.finance/cow-vaults")
-    all_vaults = response.json()
+    # Keep only the fields used below for active Base CLM vaults
+    candidates = [
+        {
+            'id': vault.get('id', ''),
+            'earnContractAddress': vault['earnContractAddress'],
+            'tvl': vault.get('tvl', 0),
+            'tokenProviderId': vault.get('tokenProviderId', '')
+        }
+        for vault in cow_vaults.result()
+        if (vault.get('chain') == 'base' and
+            vault.get('status') == 'active' and
+            vault.get('earnContractAddress'))
+    ]
+    
+    # Resolve strategy() for every vault in one multicall, then retry the
+    # vaults where it reverted with manager()
+    results = multicall_try_aggregate(w3, [
+        (vault['earnContractAddress'], STRATEGY_SELECTOR) for vault in candidates
+    ])
+    reverted = [vault for vault, (success, _) in zip(candidates, results) if not success]
+    manager_results = multicall_try_aggregate(w3, [
+        (vault['earnContractAddress'], MANAGER_SELECTOR) for vault in reverted
+    ])
     
-    # Filter for Base CLM vaults
     base_clm = []
-    for vault in all_vaults:
-        if (vault.get('chain') == 'base' and 
-            vault.get('status') == 'active' and
-            vault.get('earnContractAddress')):
-            
-            vault_addr = vault['earnContractAddress']
-            vault_id = vault.get('id', '')
-            tvl = vault.get('tvl', 0)
-            
-            # Try to get strategy address
-            try:
-                # Call strategy()
-                result = w3.eth.call({
-                    'to': vault_addr,
-                    'data': '0xa8c62e76'  # strategy()
-                })
-                
-                if result and len(result) == 32:
-                    strategy = "0x" + result.hex()[-40:]
-                    if strategy != "0x" + "0"*40:
-                        base_clm.append({
-                            'vault_id': vault_id,
-                            'vault': vault_addr,
-                            'strategy': Web3.to_checksum_address(strategy),
-                            'tvl': tvl,
-                            'platform': vault.get('tokenProviderId', '')
-                        })
-            except:
-                # Try manager() as fallback
-                try:
-                    result = w3.eth.call({
-                        'to': vault_addr,
-                        'data': '0x481c6a75'  # manager()
-                    })
-                    
-                    if result and len(result) == 32:
-                        manager = "0x" + result.hex()[-40:]
-                        if manager != "0x" + "0"*40:
-                            base_clm.append({
-                                'vault_id': vault_id,
-                                'vault': vault_addr,
-                                'strategy': Web3.to_checksum_address(manager),
-                                'tvl': tvl,
-                                'platform': vault.get('tokenProviderId', ''),
-                                'is_manager': True
-                            })
-                except:
-                    pass
+    resolved = [
+        (vault, return_data, False) for vault, (success, return_data) in zip(candidates, results)
+        if success
+    ] + [
+        (vault, return_data, True) for vault, (success, return_data) in zip(reverted, manager_results)
+        if success
+    ]
+    
+    for vault, return_data, is_manager in resolved:
+        strategy = decode_address(return_data)
+        if not strategy:
+            continue
+        
+        entry = {
+            'vault_id': vault.get('id', ''),
+            'vault': vault['earnContractAddress'],
+            'strategy': strategy,
+            'tvl': vault.get('tvl', 0),
+            'platform': vault.get('tokenProviderId', '')
+        }
+        if is_manager:
+            entry['is_manager'] = True
+        base_clm.append(entry)
     
     # Sort by TVL
     base_clm.sort(key=lambda x: x['tvl'], reverse=True)
@@ -101,61 +117,46 @@ def discover_base_clm():
         if vault.get('is_manager'):
             print(f"   Note: This is a manager address")
     
-    # Test harvest() callability
-    print("\n🧪 Testing harvest() callability...")
+    # Probe every function on the top 30 and classify each strategy by the
+    # first function that doesn't revert. These go out as JSON-RPC batches
+    # rather than a multicall so msg.sender is the bot, as in a real harvest
+    print("\n🧪 Testing harvest() and alternative functions...")
     harvestable = []
     
-    for vault in base_clm[:30]:  # Test top 30
-        try:
-            # Test harvest()
-            result = w3.eth.call({
-                'from': BOT_ADDRESS,
-                'to': vault['strategy'],
-                'data': '0x4641257d'  # harvest()
-            })
-            
+    probed = base_clm[:30]
+    results = [eth_call_outcome(response) for response in batch_eth_call(BASE_RPC, [
+        {'from': BOT_ADDRESS, 'to': vault['strategy'], 'data': '0x' + selector.hex()}
+        for vault in probed for _, selector in HARVEST_FUNCTIONS
+    ], session=SESSION, max_workers=RPC_CONCURRENCY)]
+    
+    for i, vault in enumerate(probed):
+        outcomes = results[i * len(HARVEST_FUNCTIONS):(i + 1) * len(HARVEST_FUNCTIONS)]
+        callable_funcs = [
+            func_name for (func_name, _), (status, _) in zip(HARVEST_FUNCTIONS, outcomes)
+            if status == 'ok'
+        ]
+        
+        if not callable_funcs:
+            status, revert_data = outcomes[0]
+            if status == 'failed':
+                # The node never ran the call, so nothing is known about it
+                print(f"\n⚠️ {vault['vault_id'][:30]} - harvest() probe failed (RPC error)")
+            elif revert_data[:4] != COOLDOWN_REVERT:
+                # Function exists but reverted (not just cooldown)
+                print(f"\n🔒 {vault['vault_id'][:30]} - harvest() reverted")
+            continue
+        
+        func_name = callable_funcs[0]
+        if func_name == 'harvest()':
             print(f"\n✅ {vault['vault_id'][:30]}")
             print(f"   Strategy: {vault['strategy']}")
             print(f"   TVL: ${vault['tvl']:,.0f}")
             print(f"   harvest() CALLABLE!")
-            
-            harvestable.append(vault)
-            
-        except Exception as e:
-            error = str(e)
-            if 'revert' in error.lower() and '0x26c87876' not in error:
-                # Function exists but reverted (not just cooldown)
-                print(f"\n🔒 {vault['vault_id'][:30]} - harvest() reverted")
-    
-    # Also test alternative functions
-    if len(harvestable) < 5:
-        print("\n🔧 Testing alternative functions...")
+        else:
+            print(f"  ✅ {vault['vault_id'][:30]} - {func_name} CALLABLE")
+            vault['alt_function'] = func_name
         
-        alt_functions = [
-            ('compound()', '0xa0712d68'),
-            ('tend()', '0x440368a4'),
-            ('work()', '0xe26b013b'),
-        ]
-        
-        for func_name, selector in alt_functions:
-            print(f"\nTesting {func_name}...")
-            
-            for vault in base_clm[:20]:
-                if vault in harvestable:
-                    continue
-                    
-                try:
-                    result = w3.eth.call({
-                        'from': BOT_ADDRESS,
-                        'to': vault['strategy'],
-                        'data': selector
-                    })
-                    
-                    print(f"  ✅ {vault['vault_id'][:30]} - {func_name} CALLABLE")
-                    vault['alt_function'] = func_name
-                    harvestable.append(vault)
-                except:
-                    pass
+        harvestable.append(vault)
     
     # Summary
     print("\n" + "="*60)
@@ -201,12 +202,11 @@ def discover_base_clm():
             print(f"   Function: {func_name}")
         
         # Save results
-        with open('base_clm_harvestable.json', 'w') as f:
-            json.dump({
-                'chain': 'base',
-                'found': len(harvestable),
-                'targets': targets
-            }, f, indent=2)
+        fast_json.dump_file({
+            'chain': 'base',
+            'found': len(harvestable),
+            'targets': targets
+        }, 'base_clm_harvestable.json')
         
         print(f"\n💾 Saved {len(targets)} Base targets to base_clm_harvestable.json")
         
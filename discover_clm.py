@@ -3,62 +3,47 @@
 Discover CLM strategy addresses on-chain via multicall
 """
 
-import json
-import requests
 from web3 import Web3
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any
 import time
+from urllib3.util.retry import Retry
+from janitor import fast_json
+from janitor.beefy_api import CACHE
+from janitor.clm_strategies import decode_address, fetch_cow_vaults, resolve_strategies
+from janitor.http_client import pooled_session
+from janitor.rpc import batch_eth_call, batch_rpc, multicall_try_aggregate
 
 # Configuration
 RPC = "https://arb-mainnet.g.alchemy.com/v2/5mlDO-31svMGY53J2Urqv"
-w3 = Web3(Web3.HTTPProvider(RPC))
+# One keep-alive pool for the Beefy API and RPC calls
+SESSION = pooled_session(10, 20, Retry(total=3, backoff_factor=0.3))
+w3 = Web3(Web3.HTTPProvider(RPC, session=SESSION))
+BOT_ADDRESS = "0x00823727Ec5800ae6f5068fABAEb39608dE8bf45"
 
-# Multicall3 contract on Arbitrum
-MULTICALL3 = Web3.to_checksum_address("0xcA11bde05977b3631167028862bE2a173976CA11")
+LAST_HARVEST_SELECTOR = bytes(Web3.keccak(text="lastHarvest()")[:4])
+# Solidity's dispatcher compares calldata against PUSH4 <selector>
+PUSH4 = b'\x63'
+HARVEST_SELECTOR = bytes(Web3.keccak(text="harvest()")[:4])
+HARVEST_WITH_RECIPIENT_SELECTOR = bytes(Web3.keccak(text="harvest(address)")[:4])
+HARVEST_PATTERN = PUSH4 + HARVEST_SELECTOR
+HARVEST_WITH_RECIPIENT_PATTERN = PUSH4 + HARVEST_WITH_RECIPIENT_SELECTOR
+EIP1167_PREFIX = bytes.fromhex('363d3d373d3d3d363d73')  # Minimal proxy, followed by the implementation
+# EIP-1967 storage slots holding the logic contract or its beacon
+EIP1967_IMPLEMENTATION_SLOT = '0x360894a13ba1a3210667c828492db98dca3e2076cc3735a920a3ca505d382bbc'
+EIP1967_BEACON_SLOT = '0xa3f0ad74e5423aebfd80d3ef4346578335a9a72aeaee59ff6cb3582b35133d50'
+IMPLEMENTATION_SELECTOR = bytes(Web3.keccak(text="implementation()")[:4])
 
-# Minimal ABIs
-VAULT_ABI = json.loads("""[
-    {"inputs":[],"name":"strategy","outputs":[{"internalType":"address","name":"","type":"address"}],"stateMutability":"view","type":"function"},
-    {"inputs":[],"name":"manager","outputs":[{"internalType":"address","name":"","type":"address"}],"stateMutability":"view","type":"function"},
-    {"inputs":[],"name":"clmManager","outputs":[{"internalType":"address","name":"","type":"address"}],"stateMutability":"view","type":"function"},
-    {"inputs":[],"name":"want","outputs":[{"internalType":"address","name":"","type":"address"}],"stateMutability":"view","type":"function"},
-    {"inputs":[],"name":"lastHarvest","outputs":[{"internalType":"uint256","name":"","type":"uint256"}],"stateMutability":"view","type":"function"}
-]""")
-
-STRATEGY_ABI = json.loads("""[
-    {"inputs":[],"name":"harvest","outputs":[],"stateMutability":"nonpayable","type":"function"},
-    {"inputs":[{"internalType":"address","name":"callFeeRecipient","type":"address"}],"name":"harvest","outputs":[],"stateMutability":"nonpayable","type":"function"},
-    {"inputs":[],"name":"lastHarvest","outputs":[{"internalType":"uint256","name":"","type":"uint256"}],"stateMutability":"view","type":"function"},
-    {"inputs":[],"name":"harvestOnDeposit","outputs":[{"internalType":"bool","name":"","type":"bool"}],"stateMutability":"view","type":"function"}
-]""")
-
-MULTICALL_ABI = json.loads("""[{
-    "inputs":[
-        {"components":[
-            {"internalType":"address","name":"target","type":"address"},
-            {"internalType":"bytes","name":"callData","type":"bytes"}
-        ],
-        "internalType":"struct Multicall3.Call[]","name":"calls","type":"tuple[]"}
-    ],
-    "name":"aggregate",
-    "outputs":[
-        {"internalType":"uint256","name":"blockNumber","type":"uint256"},
-        {"internalType":"bytes[]","name":"returnData","type":"bytes[]"}
-    ],
-    "stateMutability":"nonpayable","type":"function"
-}]""")
+# lastHarvest can't move again until the CLM cooldown has passed
+SIGNATURES_KEY = 'clm_harvest_signatures_arbitrum'
+CLM_COOLDOWN_SEC = 21600
 
 def get_clm_vaults() -> List[Dict]:
     """Fetch CLM vault addresses from Beefy API"""
     print("📋 Fetching CLM vaults from API...")
     
-    # Get CLM vaults
-    response = requests.get("https://api.beefy.finance/cow-vaults")
-    clm_vaults = response.json()
-    
-    # Filter for Arbitrum active CLM vaults
+    # Keep only active Arbitrum CLM vaults from the all-chain list
     arb_clm = []
-    for vault in clm_vaults:
+    for vault in fetch_cow_vaults(session=SESSION):
         if (vault.get('chain') == 'arbitrum' and 
             vault.get('status') == 'active' and
             vault.get('earnContractAddress')):  # This is the vault address
@@ -74,93 +59,144 @@ def get_clm_vaults() -> List[Dict]:
     return arb_clm
 
 def fetch_strategies_multicall(vault_addrs: List[str]) -> List[Dict]:
-    """Fetch strategy addresses via multicall"""
+    """Fetch strategy addresses via the shared disk-cached multicall resolver"""
     print(f"\n🔍 Resolving strategies for {len(vault_addrs)} vaults via multicall...")
     
     if not vault_addrs:
         return []
     
-    mc = w3.eth.contract(MULTICALL3, abi=MULTICALL_ABI)
-    calls = []
-    
-    # Build calls for each vault - try multiple getters
-    for v in vault_addrs:
-        vault_addr = Web3.to_checksum_address(v)
-        vault = w3.eth.contract(vault_addr, abi=VAULT_ABI)
-        
-        # Try strategy() first
-        calls.append((vault_addr, vault.functions.strategy().build_transaction()['data']))
-    
-    # Execute multicall
-    try:
-        _, return_data = mc.functions.aggregate(calls).call()
-    except Exception as e:
-        print(f"  ❌ Multicall failed: {e}")
-        return []
-    
-    # Parse results
-    results = []
-    for i, (vault_addr, ret_bytes) in enumerate(zip(vault_addrs, return_data)):
-        if ret_bytes and len(ret_bytes) >= 32:
-            # Extract address from bytes32
-            strategy_addr = "0x" + ret_bytes.hex()[-40:]
-            if strategy_addr != "0x" + "0"*40:  # Not zero address
-                results.append({
-                    'vault': vault_addr,
-                    'strategy': Web3.to_checksum_address(strategy_addr)
-                })
-            else:
-                # Try manager as fallback
-                results.append({
-                    'vault': vault_addr,
-                    'strategy': None
-                })
-        else:
-            results.append({
-                'vault': vault_addr,
-                'strategy': None
-            })
+    strategy_map = resolve_strategies(w3, vault_addrs)
     
+    results = [{'vault': v, 'strategy': strategy_map.get(v)} for v in vault_addrs]
     success_count = sum(1 for r in results if r['strategy'])
     print(f"  ✅ Resolved {success_count}/{len(vault_addrs)} strategies")
     
     return results
 
-def check_harvest_signature(strategy_addr: str) -> Dict:
-    """Check which harvest signature the strategy uses"""
-    print(f"  Checking harvest signature for {strategy_addr[:10]}...")
-    
-    contract = w3.eth.contract(Web3.to_checksum_address(strategy_addr), abi=STRATEGY_ABI)
+def _result_bytes(response: Dict) -> bytes:
+    """Hex result of a raw JSON-RPC response as bytes, empty on error"""
+    return Web3.to_bytes(hexstr=response.get('result') or '0x')
+
+def resolve_implementations(addresses: List[str]) -> Dict[int, str]:
+    """Index -> logic contract for EIP-1967 and beacon proxies, via batched eth_getStorageAt"""
+    responses = batch_rpc(RPC, [
+        ("eth_getStorageAt", [a, slot, "latest"])
+        for a in addresses for slot in (EIP1967_IMPLEMENTATION_SLOT, EIP1967_BEACON_SLOT)
+    ], session=SESSION)
     
-    # Check for harvest() with no params
-    try:
-        # Try to encode harvest() - if it works, the function exists
-        contract.functions.harvest().build_transaction()
-        has_simple = True
-    except:
-        has_simple = False
+    implementations = {}
+    beacons = {}
+    for i in range(len(addresses)):
+        implementation = decode_address(_result_bytes(responses[2 * i]))
+        beacon = decode_address(_result_bytes(responses[2 * i + 1]))
+        if implementation:
+            implementations[i] = implementation
+        elif beacon:
+            beacons[i] = beacon
     
-    # Check for harvest(address)
-    try:
-        contract.functions.harvest("0x0000000000000000000000000000000000000000").build_transaction()
-        has_address = True
-    except:
-        has_address = False
+    # Beacons hand out the logic contract through implementation()
+    answers = multicall_try_aggregate(w3, [(b, IMPLEMENTATION_SELECTOR) for b in beacons.values()])
+    for i, (success, return_data) in zip(beacons, answers):
+        if success and (implementation := decode_address(return_data)):
+            implementations[i] = implementation
     
-    # Check lastHarvest
-    try:
-        last_harvest = contract.functions.lastHarvest().call()
-        has_last_harvest = True
-    except:
-        last_harvest = 0
-        has_last_harvest = False
+    return implementations
+
+def get_runtime_code(addresses: List[str]) -> List[bytes]:
+    """Runtime bytecode per address via batched eth_getCode, following proxies
+
+    EIP-1167 clones carry the implementation in their code; EIP-1967 and
+    beacon proxies keep it in storage, so those slots are read as well.
+    """
+    def fetch(targets: List[str]) -> List[bytes]:
+        responses = batch_rpc(RPC, [("eth_getCode", [a, "latest"]) for a in targets],
+                              session=SESSION)
+        return [_result_bytes(r) for r in responses]
     
-    return {
-        'has_harvest': has_simple,
-        'has_harvest_address': has_address,
-        'has_lastHarvest': has_last_harvest,
-        'lastHarvest': last_harvest
+    codes = fetch(addresses)
+    implementations = {
+        i: Web3.to_checksum_address(code[10:30])
+        for i, code in enumerate(codes) if code.startswith(EIP1167_PREFIX)
     }
+    others = [i for i, code in enumerate(codes) if code and i not in implementations]
+    for j, implementation in resolve_implementations([addresses[i] for i in others]).items():
+        implementations[others[j]] = implementation
+    
+    for i, code in zip(implementations, fetch(list(implementations.values()))):
+        codes[i] = code
+    
+    return codes
+
+def _function_exists(response: Dict) -> bool:
+    """Whether an eth_call ran the function: it succeeded or reverted with a reason
+
+    Calls to a missing selector fall through the dispatcher and revert with
+    no data, while cooldown and access checks revert with a message.
+    """
+    if 'result' in response:
+        return True
+    data = (response.get('error') or {}).get('data')
+    return isinstance(data, str) and len(data) > 2
+
+def probe_harvest_signatures(strategy_addrs: List[str]) -> List[tuple]:
+    """(has_harvest, has_harvest_address) per strategy by simulating both calls from the bot"""
+    responses = batch_eth_call(RPC, [
+        {'from': BOT_ADDRESS, 'to': a, 'data': '0x' + data.hex()}
+        for a in strategy_addrs
+        for data in (HARVEST_SELECTOR,
+                     HARVEST_WITH_RECIPIENT_SELECTOR + bytes(12) + bytes.fromhex(BOT_ADDRESS[2:]))
+    ], session=SESSION)
+    return [
+        (_function_exists(responses[2 * i]), _function_exists(responses[2 * i + 1]))
+        for i in range(len(strategy_addrs))
+    ]
+
+def check_harvest_signatures(strategy_addrs: List[str]) -> List[Dict]:
+    """Check which harvest signature each strategy exposes by scanning its bytecode
+
+    Strategies whose code shows neither selector are probed with eth_call.
+
+    Results are reused from the disk cache while the strategy is still
+    inside its cooldown, since lastHarvest can't have moved yet.
+    """
+    signatures = CACHE.get(SIGNATURES_KEY) or {}
+    now = time.time()
+    to_fetch = [
+        a for a in strategy_addrs
+        if not (a in signatures and signatures[a]['has_lastHarvest'] and
+                now - signatures[a]['lastHarvest'] < CLM_COOLDOWN_SEC)
+    ]
+    print(f"  Checking harvest signatures for {len(to_fetch)} strategies "
+          f"({len(strategy_addrs) - len(to_fetch)} cached)...")
+    
+    if to_fetch:
+        codes = get_runtime_code(to_fetch)
+        last_harvests = multicall_try_aggregate(w3, [(a, LAST_HARVEST_SELECTOR) for a in to_fetch])
+        scanned = [
+            (HARVEST_PATTERN in code, HARVEST_WITH_RECIPIENT_PATTERN in code) for code in codes
+        ]
+        
+        # No selector in the code is inconclusive (an unrecognised proxy, or a
+        # compiler that doesn't dispatch via PUSH4), so ask the node instead
+        unknown = [i for i, found in enumerate(scanned) if not any(found)]
+        if unknown:
+            print(f"  Probing {len(unknown)} strategies with no harvest selector in their code...")
+            probed = probe_harvest_signatures([to_fetch[i] for i in unknown])
+            for i, found in zip(unknown, probed):
+                scanned[i] = found
+        
+        for addr, (has_harvest, has_harvest_address), (success, return_data) in zip(
+                to_fetch, scanned, last_harvests):
+            has_last_harvest = success and len(return_data) >= 32
+            signatures[addr] = {
+                'has_harvest': has_harvest,
+                'has_harvest_address': has_harvest_address,
+                'has_lastHarvest': has_last_harvest,
+                'lastHarvest': int.from_bytes(return_data[:32], 'big') if has_last_harvest else 0
+            }
+        CACHE.set(SIGNATURES_KEY, signatures, ttl=None)
+    
+    return [signatures[a] for a in strategy_addrs]
 
 def build_target_entry(vault_data: Dict, strategy_data: Dict, sig_data: Dict) -> Dict:
     """Build a target entry for targets.json"""
@@ -238,13 +274,11 @@ def main():
     valid_targets = []
     
     print("\n🔎 Checking harvest signatures...")
-    for vault, strat_data in zip(top_vaults, strategy_results):
-        if not strat_data['strategy']:
-            continue
-        
-        # Check harvest signature
-        sig_data = check_harvest_signature(strat_data['strategy'])
-        
+    resolved = [(vault, strat_data) for vault, strat_data in zip(top_vaults, strategy_results)
+                if strat_data['strategy']]
+    signatures = check_harvest_signatures([strat_data['strategy'] for _, strat_data in resolved])
+    
+    for (vault, strat_data), sig_data in zip(resolved, signatures):
         # Build target if valid
         if sig_data['has_harvest'] or sig_data['has_harvest_address']:
             target = build_target_entry(vault, strat_data, sig_data)
@@ -281,8 +315,7 @@ def main():
             'total_found': len(valid_targets)
         }
         
-        with open('clm_targets_discovered.json', 'w') as f:
-            json.dump(output, f, indent=2)
+        fast_json.dump_file(output, 'clm_targets_discovered.json')
         
         print(f"\n💾 Saved {len(valid_targets)} targets to clm_targets_discovered.json")
         print("\n🎯 Next steps:")
@@ -3,28 +3,28 @@
 Enhanced discovery with integrated vault scoring
 """
 
-import json
 import time
 from web3 import Web3
 from typing import Dict, List, Optional, Tuple
-from vault_scoring import VaultEvaluator, VaultScore
+from urllib3.util.retry import Retry
+from janitor import fast_json
+from janitor.beefy_api import get_json
+from janitor.http_client import pooled_session
+from vault_scoring import VaultEvaluator, VaultScore, chain_config
+
+# One keep-alive pool for the Beefy API and RPC calls
+SESSION = pooled_session(10, 20, Retry(total=3, backoff_factor=0.3))
 
 class ScoredDiscovery:
     """Discovery with integrated scoring"""
     
     def __init__(self, chain: str = "arbitrum"):
         self.chain = chain
-        self.evaluator = VaultEvaluator(chain)
+        self.evaluator = VaultEvaluator(chain, session=SESSION)
         
         # Setup RPC
-        if chain == "arbitrum":
-            self.rpc = "https://arb-mainnet.g.alchemy.com/v2/5mlDO-31svMGY53J2Urqv"
-        elif chain == "base":
-            self.rpc = "https://base-mainnet.g.alchemy.com/v2/3AvaLFHobnzEIToydrEiN"
-        else:
-            raise ValueError(f"Unsupported chain: {chain}")
-        
-        self.w3 = Web3(Web3.HTTPProvider(self.rpc))
+        self.rpc = chain_config(chain).rpc
+        self.w3 = Web3(Web3.HTTPProvider(self.rpc, session=SESSION))
         self.bot_address = "0x00823727Ec5800ae6f5068fABAEb39608dE8bf45"
     
     def discover_and_score(self, vault_addresses: List[str], vault_info: Dict) -> List[Tuple[VaultScore, Dict]]:
@@ -35,29 +35,33 @@ class ScoredDiscovery:
         
         scored_vaults = []
         
-        for address in vault_addresses:
+        # Probe callability for every vault in one batched pass, then score
+        # the callable ones locally with the probe results
+        call_surfaces = self.evaluator.score_call_surfaces(vault_addresses)
+        callable_vaults = [
+            (address, call_surface) for address, call_surface in zip(vault_addresses, call_surfaces)
+            if call_surface[0].value[0] > 0
+        ]
+        scores = dict(zip(
+            (address for address, _ in callable_vaults),
+            self.evaluator.evaluate_many(
+                [self._vault_input(address, vault_info.get(address, {}))
+                 for address, _ in callable_vaults],
+                call_surfaces=[call_surface for _, call_surface in callable_vaults]
+            )
+        ))
+        
+        for address, (_, harvest_func) in zip(vault_addresses, call_surfaces):
             info = vault_info.get(address, {})
             
             print(f"\n📋 Testing: {info.get('name', address[:10])}...")
             
-            # Test callability
-            call_score, harvest_func = self.evaluator.score_call_surface(address)
-            
             # Skip if not callable
-            if call_score.value[0] == 0:
+            score = scores.get(address)
+            if score is None:
                 print(f"   ❌ Not callable: {harvest_func}")
                 continue
             
-            # Full evaluation
-            score = self.evaluator.evaluate_vault(
-                vault_name=info.get('name', f"Vault_{address[:8]}"),
-                address=address,
-                tvl_usd=info.get('tvl', 1_000_000),
-                protocol=info.get('protocol', 'unknown'),
-                harvest_frequency_hours=info.get('frequency_hours', 24),
-                expected_reward_usd=info.get('expected_reward', 0.40)
-            )
-            
             print(f"   ✅ Score: {score.total_score}/24")
             print(f"   🎯 {score.recommendation}")
             
@@ -74,6 +78,18 @@ class ScoredDiscovery:
         
         return scored_vaults
     
+    @staticmethod
+    def _vault_input(address: str, info: Dict) -> Dict:
+        """evaluate_many input for a vault, with discovery's defaults for missing info"""
+        return {
+            'name': info.get('name', f"Vault_{address[:8]}"),
+            'address': address,
+            'tvl': info.get('tvl', 1_000_000),
+            'protocol': info.get('protocol', 'unknown'),
+            'frequency_hours': info.get('frequency_hours', 24),
+            'expected_reward': info.get('expected_reward', 0.40)
+        }
+    
     def generate_discovery_report(self, scored_vaults: List[Tuple[VaultScore, Dict]]):
         """Generate comprehensive discovery report"""
         print(f"\n{'='*60}")
@@ -86,9 +102,14 @@ class ScoredDiscovery:
             print("   ❌ No vaults met the minimum score threshold")
             return
         
-        # Group by score level
-        highly_recommended = [v for v in scored_vaults if v[0].total_score >= 20]
-        recommended = [v for v in scored_vaults if 16 <= v[0].total_score < 20]
+        # Group by score level in one pass (input is already sorted by score)
+        highly_recommended, recommended = [], []
+        for entry in scored_vaults:
+            total = entry[0].total_score
+            if total >= 20:
+                highly_recommended.append(entry)
+            elif total >= 16:
+                recommended.append(entry)
         
         print(f"\n🏆 HIGHLY RECOMMENDED ({len(highly_recommended)} vaults):")
         for score, config in highly_recommended[:5]:  # Top 5
@@ -107,13 +128,12 @@ class ScoredDiscovery:
         targets = [config for _, config in scored_vaults]
         
         filename = f"{self.chain}_scored_targets.json"
-        with open(filename, 'w') as f:
-            json.dump({
-                'chain': self.chain,
-                'discovered': len(scored_vaults),
-                'timestamp': time.strftime('%Y-%m-%d %H:%M:%S'),
-                'targets': targets[:20]  # Top 20
-            }, f, indent=2)
+        fast_json.dump_file({
+            'chain': self.chain,
+            'discovered': len(scored_vaults),
+            'timestamp': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'targets': targets[:20]  # Top 20
+        }, filename)
         
         print(f"\n💾 Saved top {min(20, len(targets))} targets to {filename}")
         
@@ -121,17 +141,14 @@ class ScoredDiscovery:
         print(f"\n📝 TOP 3 CONFIGURATIONS:")
         for i, (score, config) in enumerate(scored_vaults[:3], 1):
             print(f"\n{i}. {score.vault_name} (Score: {score.total_score}/24)")
-            print(json.dumps(config, indent=2))
+            print(fast_json.dumps(config, indent=True).decode())
     
     def quick_discover_beefy(self, limit: int = 50) -> List[Tuple[VaultScore, Dict]]:
         """Quick discovery of Beefy vaults"""
-        import requests
-        
         print(f"\n🔍 Quick discovering Beefy vaults on {self.chain}...")
         
         # Get vaults from API
-        response = requests.get("https://api.beefy.finance/vaults")
-        all_vaults = response.json()
+        all_vaults = get_json('/vaults', session=SESSION)
         
         # Filter for chain
         chain_vaults = [v for v in all_vaults 
@@ -3,15 +3,25 @@
 Evaluate all current janitor bot vaults using the scoring rubric
 """
 
-import json
+import re
 import sys
+from collections import defaultdict
+from datetime import datetime, timezone
+from janitor import fast_json
 from vault_scoring import VaultEvaluator, VaultScore
 from typing import List, Dict
 
+# CLM is Beefy's concentrated liquidity product
+BEEFY_NAME = re.compile(r'beefy|clm', re.IGNORECASE)
+
+def short_address(address: str) -> str:
+    """0x1234abcd...89abcdef form used in the report lines"""
+    return f"{address[:10]}...{address[-8:]}"
+
 def load_current_targets() -> Dict:
     """Load current targets from janitor config"""
-    with open('janitor/targets.json', 'r') as f:
-        config = json.load(f)
+    with open('janitor/targets.json', 'rb') as f:
+        config = fast_json.loads(f.read())
     
     all_targets = []
     for chain, chain_config in config['chains'].items():
@@ -31,12 +41,9 @@ def evaluate_current_vaults():
     print(f"\n📋 Evaluating {len(targets)} vaults across all chains...")
     
     # Group by chain
-    by_chain = {}
+    by_chain = defaultdict(list)
     for target in targets:
-        chain = target['_chain']
-        if chain not in by_chain:
-            by_chain[chain] = []
-        by_chain[chain].append(target)
+        by_chain[target['_chain']].append(target)
     
     all_scores = []
     
@@ -47,62 +54,79 @@ def evaluate_current_vaults():
         
         evaluator = VaultEvaluator(chain)
         
-        for target in chain_targets:
-            # Skip non-harvest targets
-            if target.get('type') != 'harvest':
-                continue
-            
-            # Estimate values based on config
-            tvl = target.get('_tvl', 1_000_000)  # Default 1M if not specified
-            
+        # Skip non-harvest targets
+        harvest_targets = [t for t in chain_targets if t.get('type') == 'harvest']
+        vault_inputs = []
+        
+        for target in harvest_targets:
             # Determine protocol
-            protocol = 'unknown'
-            if 'beefy' in target['name'].lower():
-                protocol = 'beefy'
-            elif 'clm' in target['name'].lower():
-                protocol = 'beefy'  # CLM is Beefy's concentrated liquidity
-            
-            # Estimate frequency from cooldown
-            cooldown_sec = target.get('cooldownSec', 43200)
-            frequency_hours = cooldown_sec / 3600
-            
-            # Get expected reward
-            expected_reward = target.get('fixedRewardUSD', 0.40)
-            
-            print(f"\n📊 Evaluating: {target['name']}")
-            print(f"   Address: {target['address'][:10]}...{target['address'][-8:]}")
-            
-            score = evaluator.evaluate_vault(
-                vault_name=target['name'],
-                address=target['address'],
-                tvl_usd=tvl,
-                protocol=protocol,
-                harvest_frequency_hours=frequency_hours,
-                expected_reward_usd=expected_reward
-            )
+            protocol = 'beefy' if BEEFY_NAME.search(target['name']) else 'unknown'
             
+            vault_inputs.append({
+                'name': target['name'],
+                'address': target['address'],
+                # Estimate values based on config
+                'tvl': target.get('_tvl', 1_000_000),  # Default 1M if not specified
+                'protocol': protocol,
+                # Estimate frequency from cooldown
+                'frequency_hours': target.get('cooldownSec', 43200) / 3600,
+                'expected_reward': target.get('fixedRewardUSD', 0.40)
+            })
+        
+        # One evaluator per chain probes every target's call surface in a
+        # single batched pass; the rest of the rubric is local
+        scores = evaluator.evaluate_many(vault_inputs)
+        
+        # Collect the chain's mini reports and write them in one go
+        out = []
+        for target, score in zip(harvest_targets, scores):
             # Add chain info
             score.chain = chain
             all_scores.append(score)
             
             # Print mini report
-            print(f"   Score: {score.total_score}/24 - {score.recommendation}")
-            print(f"   Enabled: {'✅' if target.get('enabled', True) else '❌'}")
+            enabled = '✅' if target.get('enabled', True) else '❌'
+            out.append(
+                f"\n📊 Evaluating: {target['name']}\n"
+                f"   Address: {short_address(target['address'])}\n"
+                f"   Score: {score.total_score}/24 - {score.recommendation}\n"
+                f"   Enabled: {enabled}"
+            )
+        
+        if out:
+            sys.stdout.write('\n'.join(out) + '\n')
     
     # Sort all scores
     all_scores.sort(key=lambda x: x.total_score, reverse=True)
     
+    # Group by recommendation in one pass (buckets keep the sorted order)
+    highly_recommended, recommended, marginal, not_recommended = [], [], [], []
+    for s in all_scores:
+        total = s.total_score
+        if total >= 20:
+            highly_recommended.append(s)
+        elif total >= 16:
+            recommended.append(s)
+        elif total >= 12:
+            marginal.append(s)
+        else:
+            not_recommended.append(s)
+    
     print("\n" + "="*80)
     print("TOP PERFORMERS (Score >= 20)")
     print("="*80)
     
-    top_performers = [s for s in all_scores if s.total_score >= 20]
+    top_performers = highly_recommended
     if top_performers:
+        out = []
         for score in top_performers:
-            print(f"\n🏆 {score.vault_name} ({score.chain})")
-            print(f"   Score: {score.total_score}/24")
-            print(f"   TVL: ${score.tvl_amount:,.0f}")
-            print(f"   Address: {score.address[:10]}...{score.address[-8:]}")
+            out.append(
+                f"\n🏆 {score.vault_name} ({score.chain})\n"
+                f"   Score: {score.total_score}/24\n"
+                f"   TVL: ${score.tvl_amount:,.0f}\n"
+                f"   Address: {short_address(score.address)}"
+            )
+        sys.stdout.write('\n'.join(out) + '\n')
     else:
         print("\n⚠️ No vaults scored 20+ points")
     
@@ -110,27 +134,14 @@ def evaluate_current_vaults():
     print("RECOMMENDED ACTIONS")
     print("="*80)
     
-    # Group by recommendation
-    highly_recommended = [s for s in all_scores if s.total_score >= 20]
-    recommended = [s for s in all_scores if 16 <= s.total_score < 20]
-    marginal = [s for s in all_scores if 12 <= s.total_score < 16]
-    not_recommended = [s for s in all_scores if s.total_score < 12]
-    
-    print(f"\n✅ Highly Recommended ({len(highly_recommended)} vaults):")
-    for s in highly_recommended:
-        print(f"   - {s.vault_name} ({s.chain}): {s.total_score}/24")
-    
-    print(f"\n✅ Recommended ({len(recommended)} vaults):")
-    for s in recommended:
-        print(f"   - {s.vault_name} ({s.chain}): {s.total_score}/24")
-    
-    print(f"\n⚠️ Marginal ({len(marginal)} vaults):")
-    for s in marginal:
-        print(f"   - {s.vault_name} ({s.chain}): {s.total_score}/24")
-    
-    print(f"\n❌ Not Recommended ({len(not_recommended)} vaults):")
-    for s in not_recommended:
-        print(f"   - {s.vault_name} ({s.chain}): {s.total_score}/24")
+    out = []
+    for label, bucket in (("✅ Highly Recommended", highly_recommended),
+                          ("✅ Recommended", recommended),
+                          ("⚠️ Marginal", marginal),
+                          ("❌ Not Recommended", not_recommended)):
+        out.append(f"\n{label} ({len(bucket)} vaults):")
+        out.extend(f"   - {s.vault_name} ({s.chain}): {s.total_score}/24" for s in bucket)
+    sys.stdout.write('\n'.join(out) + '\n')
     
     # Summary statistics
     print("\n" + "="*80)
@@ -149,7 +160,7 @@ def evaluate_current_vaults():
     
     # Save detailed report
     report = {
-        'timestamp': __import__('datetime').datetime.now().isoformat(),
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
         'total_vaults': len(all_scores),
         'average_score': avg_score,
         'by_recommendation': {
@@ -179,8 +190,7 @@ def evaluate_current_vaults():
         ]
     }
     
-    with open('vault_evaluation_report.json', 'w') as f:
-        json.dump(report, f, indent=2)
+    fast_json.dump_file(report, 'vault_evaluation_report.json')
     
     print(f"\n💾 Detailed report saved to vault_evaluation_report.json")
     
@@ -3,61 +3,45 @@
 Find truly active Beefy vaults with TVL and fees
 """
 
-import json
-import requests
+import heapq
+from janitor import fast_json
+from janitor.beefy_api import call_fee as lookup_call_fee, load_snapshot
 
 def main():
     print("🔍 Finding Active Beefy Vaults on Arbitrum...")
     
-    # Get vaults
-    vaults = requests.get("https://api.beefy.finance/vaults").json()
+    # Get vaults, TVL, APY and fees concurrently
+    snapshot = load_snapshot()
+    vaults, tvl_data, apy_data, fees_data = snapshot.vaults, snapshot.tvl, snapshot.apy, snapshot.fees
     
-    # Get TVL data
-    tvl_data = requests.get("https://api.beefy.finance/tvl").json()
-    
-    # Get APY data
-    apy_data = requests.get("https://api.beefy.finance/apy").json()
-    
-    # Get fees
-    fees_data = requests.get("https://api.beefy.finance/fees").json()
-    
-    # Filter for Arbitrum active vaults
+    # Filter for Arbitrum active vaults; only vaults past the TVL cut pay
+    # for the fee/APY lookups and the row dict
     arbitrum_vaults = []
+    tvl_of, apy_of = tvl_data.get, apy_data.get
     
     for vault in vaults:
         if vault.get('chain') == 'arbitrum' and vault.get('status') == 'active':
             vault_id = vault['id']
             
-            # Get TVL
-            tvl = tvl_data.get(vault_id, 0)
-            
             # Skip if no TVL
+            tvl = tvl_of(vault_id, 0)
             if tvl < 10000:  # Less than $10k
                 continue
             
-            # Get fees
-            vault_fees = fees_data.get(vault_id, {})
-            perf_fees = vault_fees.get('performance', {})
-            call_fee = perf_fees.get('call', 0)
-            
-            # Get APY
-            apy = apy_data.get(vault_id, 0)
+            call_fee = lookup_call_fee(fees_data, vault_id)
             
             arbitrum_vaults.append({
                 'id': vault_id,
                 'name': vault.get('name', ''),
                 'address': vault.get('earnContractAddress'),
                 'tvl': tvl,
-                'apy': apy,
+                'apy': apy_of(vault_id, 0),
                 'call_fee': call_fee,
                 'call_fee_bps': int(call_fee * 10000),
                 'strategy': vault.get('strategy'),
                 'assets': vault.get('assets', [])
             })
     
-    # Sort by TVL
-    arbitrum_vaults.sort(key=lambda x: x['tvl'], reverse=True)
-    
     print(f"\n✅ Found {len(arbitrum_vaults)} vaults with TVL > $10k")
     
     # Show top vaults with call fees
@@ -67,7 +51,9 @@ def main():
     print("\n🎯 Top Harvestable Vaults:")
     print("-" * 90)
     
-    for i, vault in enumerate(vaults_with_fees[:10], 1):
+    # Only the top few are shown, so skip sorting the full list
+    top_with_fees = heapq.nlargest(10, vaults_with_fees, key=lambda x: x['tvl'])
+    for i, vault in enumerate(top_with_fees, 1):
         print(f"\n{i}. {vault['name']}")
         print(f"   Address: {vault['address']}")
         print(f"   TVL: ${vault['tvl']:,.0f}")
@@ -79,14 +65,13 @@ def main():
     print("\n📊 Top TVL Vaults (all):")
     print("-" * 90)
     
-    for i, vault in enumerate(arbitrum_vaults[:5], 1):
+    for i, vault in enumerate(heapq.nlargest(5, arbitrum_vaults, key=lambda x: x['tvl']), 1):
         print(f"\n{i}. {vault['name']} - TVL: ${vault['tvl']:,.0f}")
         print(f"   Address: {vault['address']}")
         print(f"   Call Fee: {vault['call_fee_bps']/100:.2f}%")
     
     # Save results
-    with open('active_beefy_vaults.json', 'w') as f:
-        json.dump(vaults_with_fees[:10], f, indent=2)
+    fast_json.dump_file(top_with_fees, 'active_beefy_vaults.json')
     
     print(f"\n💾 Saved top vaults to active_beefy_vaults.json")
 
@@ -3,29 +3,24 @@
 Find actual Base Beefy strategy addresses
 """
 
-import requests
-import json
-from web3 import Web3
+import heapq
+from janitor import fast_json
+from janitor.beefy_api import get_json, iter_items
 
 def find_base_beefy_strategies():
     """Get Base Beefy vaults with strategy addresses"""
     
     print("🔍 Fetching Base Beefy vaults...")
     
-    # Get all vaults
-    response = requests.get("https://api.beefy.finance/vaults")
-    all_vaults = response.json()
-    
-    # Filter for Base vaults
-    base_vaults = [v for v in all_vaults if v.get('chain') == 'base' and v.get('status') == 'active']
+    # Filter for Base vaults as the all-chain list streams in
+    base_vaults = [v for v in iter_items('/vaults') if v.get('chain') == 'base' and v.get('status') == 'active']
     
     print(f"Found {len(base_vaults)} active vaults on Base")
     
     # Get Base-specific vault details with strategies
-    base_details = requests.get("https://api.beefy.finance/vaults/base")
-    if base_details.status_code == 200:
-        base_data = base_details.json()
-    else:
+    try:
+        base_data = get_json('/vaults/base')
+    except Exception:
         base_data = {}
     
     # Find vaults with good TVL and harvest potential
@@ -58,20 +53,21 @@ def find_base_beefy_strategies():
             'platform': vault.get('platformId', '')
         })
     
-    # Sort by TVL
-    harvestable.sort(key=lambda x: x.get('tvl', 0), reverse=True)
-    
     print(f"\n✅ Found {len(harvestable)} harvestable vaults")
+    
+    # Only the top 20 are reported, so skip sorting the full list
+    top_vaults = heapq.nlargest(20, harvestable, key=lambda x: x.get('tvl', 0))
+    
     print("\nTop 10 Base Beefy Vaults:")
     print("-" * 60)
     
-    for i, vault in enumerate(harvestable[:10]):
+    for i, vault in enumerate(top_vaults[:10]):
         print(f"\n{i+1}. {vault['name']}")
         print(f"   Strategy: {vault['strategy']}")
         print(f"   TVL: ${vault['tvl']:,.0f}")
         print(f"   Platform: {vault['platform']}")
     
-    return harvestable
+    return top_vaults
 
 def create_base_targets(vaults):
     """Create targets configuration for Base vaults"""
@@ -126,11 +122,10 @@ if __name__ == "__main__":
         # Save Base targets
         base_config = {
             "base_targets": targets,
-            "top_vaults": vaults[:20]
+            "top_vaults": vaults
         }
         
-        with open('base_targets.json', 'w') as f:
-            json.dump(base_config, f, indent=2)
+        fast_json.dump_file(base_config, 'base_targets.json')
         
         print("\n💾 Saved to base_targets.json")
         print("\n🎯 Ready to add to your janitor bot configuration!")
\ No newline at end of file
@@ -3,20 +3,18 @@
 Find harvestable vaults on Base network
 """
 
-import requests
-import json
+import heapq
+from janitor import fast_json
+from janitor.beefy_api import iter_items
 
 def find_beefy_base_vaults():
     """Find Beefy vaults on Base"""
     print("🔍 Searching for Beefy vaults on Base network...")
     
     # Beefy API for Base
-    response = requests.get("https://api.beefy.finance/vaults/base")
-    vaults = response.json()
-    
-    # Filter for active vaults with good TVL
+    # Filter for active vaults with good TVL as the list streams in
     active_vaults = []
-    for vault in vaults:
+    for vault in iter_items('/vaults/base'):
         if (vault.get('status') == 'active' and 
             vault.get('tvl', 0) > 100000 and  # $100k+ TVL
             'strategy' in vault):
@@ -28,18 +26,19 @@ def find_beefy_base_vaults():
                 'strategy': vault['strategy']
             })
     
-    # Sort by TVL
-    active_vaults.sort(key=lambda x: x['tvl'], reverse=True)
-    
     print(f"\n✅ Found {len(active_vaults)} active Beefy vaults on Base")
+    
+    # Only the top 20 are reported, so skip sorting the full list
+    top_vaults = heapq.nlargest(20, active_vaults, key=lambda x: x['tvl'])
+    
     print("\nTop 10 by TVL:")
-    for i, vault in enumerate(active_vaults[:10]):
+    for i, vault in enumerate(top_vaults[:10]):
         print(f"{i+1}. {vault['name']}")
         print(f"   TVL: ${vault['tvl']:,.0f}")
         print(f"   APY: {vault['apy']:.1f}%")
         print(f"   Strategy: {vault['strategy'][:42]}...")
     
-    return active_vaults
+    return top_vaults
 
 def find_aerodrome_pools():
     """Find Aerodrome (Base's main DEX) pools"""
@@ -99,13 +98,12 @@ if __name__ == "__main__":
     
     # Save results
     results = {
-        'beefy_vaults': beefy_vaults[:20],  # Top 20
+        'beefy_vaults': beefy_vaults,  # Top 20
         'aerodrome': aerodrome,
         'other_protocols': other
     }
     
-    with open('base_opportunities.json', 'w') as f:
-        json.dump(results, f, indent=2)
+    fast_json.dump_file(results, 'base_opportunities.json')
     
     print("\n💾 Results saved to base_opportunities.json")
     print("\n🎯 Next steps:")
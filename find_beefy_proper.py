@@ -3,67 +3,56 @@
 Find real harvestable Beefy vaults on Arbitrum using proper API approach
 """
 
-import json
-import requests
+import heapq
+from operator import itemgetter
+from concurrent.futures import ThreadPoolExecutor
+from janitor import fast_json
+from janitor.beefy_api import call_fee as lookup_call_fee, get_json, iter_items
 from typing import Dict, List
 
 ARBITRUM_CHAIN_ID = "42161"
 MIN_TVL = 50000  # $50k minimum for good activity
+STABLECOINS = frozenset({'USDC', 'USDT', 'DAI'})
 
 def main():
     print("🧹 Finding Real Beefy Vaults on Arbitrum")
     print("=" * 80)
     
-    # 1. Get all vaults
-    print("\n1️⃣ Fetching vault metadata...")
-    vaults_response = requests.get("https://api.beefy.finance/vaults")
-    all_vaults = vaults_response.json()
-    
-    # Filter Arbitrum active vaults
-    arb_vaults = [v for v in all_vaults 
-                  if v.get('chain') == 'arbitrum' 
-                  and v.get('status') == 'active'
-                  and v.get('strategy')  # Must have a strategy (non-CLM)
-                  and 'clm' not in v.get('id', '').lower()]  # Skip CLM for now
+    # Vault metadata, fee policies, TVL and APY are independent; fetch the
+    # small ones in the background while the vault list streams in
+    print("\n📡 Fetching vaults, fees, TVL and APY...")
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        side_data = executor.map(get_json, ('/fees', '/tvl', '/apy'))
+        
+        # Filter Arbitrum active vaults
+        arb_vaults = [v for v in iter_items('/vaults')
+                      if v.get('chain') == 'arbitrum' 
+                      and v.get('status') == 'active'
+                      and v.get('strategy')  # Must have a strategy (non-CLM)
+                      and 'clm' not in v.get('id', '').lower()]  # Skip CLM for now
+        
+        fees_data, tvl_data, apy_data = side_data
     
     print(f"   Found {len(arb_vaults)} active standard vaults on Arbitrum")
     
-    # 2. Get fee policies
-    print("\n2️⃣ Fetching fee policies...")
-    fees_response = requests.get("https://api.beefy.finance/fees")
-    fees_data = fees_response.json()
-    
-    # 3. Get TVL data (proper way - by chainId)
-    print("\n3️⃣ Fetching TVL data...")
-    tvl_response = requests.get("https://api.beefy.finance/tvl")
-    tvl_data = tvl_response.json()
+    # TVL data is keyed by chainId
     arbitrum_tvl = tvl_data.get(ARBITRUM_CHAIN_ID, {})
     
-    # 4. Get APY data
-    apy_response = requests.get("https://api.beefy.finance/apy")
-    apy_data = apy_response.json()
-    
-    # Process vaults
+    # Process vaults; only vaults past the TVL cut pay for the fee/APY
+    # lookups and the row dict
     candidates = []
+    tvl_of, apy_of = arbitrum_tvl.get, apy_data.get
     for vault in arb_vaults:
         vault_id = vault['id']
-        tvl = arbitrum_tvl.get(vault_id, 0)
         
         # Skip low TVL
+        tvl = tvl_of(vault_id, 0)
         if tvl < MIN_TVL:
             continue
-            
-        # Get fees
-        vault_fees = fees_data.get(vault_id, {})
-        performance_fees = vault_fees.get('performance', {})
-        call_fee = performance_fees.get('call', 0)
         
         # If no explicit call fee, use Beefy standard
-        if call_fee == 0:
-            call_fee = 0.0005  # 0.05% standard
-        
-        # Get APY
-        apy = apy_data.get(vault_id, 0)
+        call_fee = lookup_call_fee(fees_data, vault_id) or 0.0005  # 0.05% standard
+        apy = apy_of(vault_id, 0)
         
         candidates.append({
             'id': vault_id,
@@ -79,9 +68,6 @@ def main():
             'assets': vault.get('assets', [])
         })
     
-    # Sort by TVL
-    candidates.sort(key=lambda x: x['tvl'], reverse=True)
-    
     print(f"\n✅ Found {len(candidates)} vaults with TVL > ${MIN_TVL:,}")
     
     # Show top candidates
@@ -90,7 +76,9 @@ def main():
     print(f"{'#':<3} {'Name':<30} {'TVL':<15} {'APY':<8} {'Fee':<8} {'Strategy'}")
     print("-" * 100)
     
-    top_10 = candidates[:10]
+    # Only the top few are shown or picked, so skip sorting the full list
+    by_tvl = itemgetter('tvl')
+    top_10 = heapq.nlargest(10, candidates, key=by_tvl)
     for i, vault in enumerate(top_10, 1):
         print(f"{i:<3} {vault['name'][:30]:<30} ${vault['tvl']:>13,.0f} {vault['apy']:>6.1f}% {vault['call_fee_bps']:>4} bps  {vault['strategy'][:30]}...")
     
@@ -98,24 +86,30 @@ def main():
     print("\n📋 Recommended 3 Starter Targets:")
     print("-" * 100)
     
-    # Try to get different types
+    # Try to get different types; vault ids are unique, so track those
+    # rather than comparing row dicts
     selected = []
+    chosen_ids = set()
+    
+    def select(vault: Dict):
+        selected.append(vault)
+        chosen_ids.add(vault['id'])
     
     # 1. Highest TVL vault
-    if len(candidates) > 0:
-        selected.append(candidates[0])
+    if len(top_10) > 0:
+        select(top_10[0])
     
     # 2. A stablecoin vault if available
-    stable_vaults = [v for v in candidates if any(asset in ['USDC', 'USDT', 'DAI'] for asset in v.get('assets', []))]
-    if stable_vaults and stable_vaults[0] not in selected:
-        selected.append(stable_vaults[0])
-    elif len(candidates) > 1:
-        selected.append(candidates[1])
+    stable_vaults = heapq.nlargest(1, (v for v in candidates if not STABLECOINS.isdisjoint(v.get('assets', ()))), key=by_tvl)
+    if stable_vaults and stable_vaults[0]['id'] not in chosen_ids:
+        select(stable_vaults[0])
+    elif len(top_10) > 1:
+        select(top_10[1])
     
     # 3. Another high TVL
-    for v in candidates:
-        if v not in selected and len(selected) < 3:
-            selected.append(v)
+    for v in top_10:
+        if v['id'] not in chosen_ids and len(selected) < 3:
+            select(v)
             break
     
     for i, vault in enumerate(selected, 1):
@@ -130,8 +124,7 @@ def main():
         print(f"   Verify Strategy: https://arbiscan.io/address/{vault['strategy'][:42]}#code")
     
     # Save selected vaults
-    with open('selected_beefy_vaults.json', 'w') as f:
-        json.dump(selected, f, indent=2)
+    fast_json.dump_file(selected, 'selected_beefy_vaults.json')
     
     print(f"\n💾 Saved {len(selected)} selected vaults to selected_beefy_vaults.json")
     
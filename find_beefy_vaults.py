@@ -3,8 +3,9 @@
 Find and verify Beefy Finance vaults on Arbitrum with harvest fees
 """
 
-import json
-import requests
+import heapq
+from janitor import fast_json
+from janitor.beefy_api import call_fee, get_json, iter_items
 from typing import Dict, List
 
 def fetch_beefy_vaults():
@@ -13,12 +14,9 @@ def fetch_beefy_vaults():
     print("🔍 Fetching Beefy vaults...")
     
     # Get all vaults
-    vaults_response = requests.get("https://api.beefy.finance/vaults")
-    vaults = vaults_response.json()
-    
-    # Filter for Arbitrum active vaults
+    # Filter for Arbitrum active vaults as the list streams in
     arbitrum_vaults = [
-        v for v in vaults 
+        v for v in iter_items('/vaults')
         if v.get('chain') == 'arbitrum' and v.get('status') == 'active'
     ]
     
@@ -31,39 +29,28 @@ def fetch_beefy_fees():
     
     print("💰 Fetching Beefy fees...")
     
-    fees_response = requests.get("https://api.beefy.finance/fees")
-    fees = fees_response.json()
+    fees = get_json('/fees')
     
     return fees
 
 def find_harvestable_vaults(vaults: List[Dict], fees: Dict) -> List[Dict]:
     """Find vaults with non-zero call fees"""
     
-    harvestable = []
-    
-    for vault in vaults:
-        vault_id = vault.get('id')
-        
-        # Check if vault has fees data
-        if vault_id in fees:
-            vault_fees = fees[vault_id]
-            
-            # Check for call fee (harvest fee for callers)
-            call_fee = vault_fees.get('performance', {}).get('call', 0)
-            
-            if call_fee > 0:
-                harvestable.append({
-                    'id': vault_id,
-                    'name': vault.get('name', ''),
-                    'earnContractAddress': vault.get('earnContractAddress'),
-                    'strategy': vault.get('strategy'),
-                    'assets': vault.get('assets', []),
-                    'callFeeBps': int(call_fee * 10000),  # Convert to basis points
-                    'tvl': vault.get('tvl', 0),
-                    'apy': vault.get('apy', 0)
-                })
-    
-    return harvestable
+    # Call fee (harvest fee for callers) per vault; 0 when it has no fees data
+    return [
+        {
+            'id': vault.get('id'),
+            'name': vault.get('name', ''),
+            'earnContractAddress': vault.get('earnContractAddress'),
+            'strategy': vault.get('strategy'),
+            'assets': vault.get('assets', []),
+            'callFeeBps': int(fee * 10000),  # Convert to basis points
+            'tvl': vault.get('tvl', 0),
+            'apy': vault.get('apy', 0)
+        }
+        for vault, fee in ((vault, call_fee(fees, vault.get('id'))) for vault in vaults)
+        if fee > 0
+    ]
 
 def main():
     """Find best Beefy vaults for harvesting"""
@@ -80,14 +67,14 @@ def main():
     
     print(f"\n📊 Found {len(harvestable)} harvestable vaults")
     
-    # Sort by TVL for best opportunities
-    harvestable.sort(key=lambda x: x.get('tvl', 0), reverse=True)
+    # Best opportunities by TVL; only the top 10 are shown, so skip sorting the full list
+    top_10 = heapq.nlargest(10, harvestable, key=lambda x: x.get('tvl', 0))
     
     # Show top 10 candidates
     print("\n🎯 Top 10 Harvest Candidates (by TVL):")
     print("-" * 80)
     
-    for i, vault in enumerate(harvestable[:10], 1):
+    for i, vault in enumerate(top_10, 1):
         print(f"\n{i}. {vault['name']}")
         print(f"   Vault Address: {vault['earnContractAddress']}")
         print(f"   Call Fee: {vault['callFeeBps']/100:.2f}% ({vault['callFeeBps']} bps)")
@@ -97,10 +84,9 @@ def main():
         print(f"   Arbiscan: https://arbiscan.io/address/{vault['earnContractAddress']}")
     
     # Save top candidates to file
-    top_vaults = harvestable[:5]
+    top_vaults = top_10[:5]
     
-    with open('beefy_candidates.json', 'w') as f:
-        json.dump(top_vaults, f, indent=2)
+    fast_json.dump_file(top_vaults, 'beefy_candidates.json')
     
     print(f"\n💾 Saved top {len(top_vaults)} vaults to beefy_candidates.json")
     
@@ -132,7 +118,7 @@ def main():
             "_note": f"{vault['name']} - Verify on Arbiscan first!"
         }
         
-        print(json.dumps(config, indent=2))
+        print(fast_json.dumps(config, indent=True).decode())
         print(",")
     
     print("\n⚠️  IMPORTANT: Verify each vault on Arbiscan before enabling!")
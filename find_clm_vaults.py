@@ -4,29 +4,25 @@ Find Beefy CLM (Concentrated Liquidity Manager) vaults on Arbitrum
 CLM vaults typically have more frequent harvests
 """
 
-import json
-import requests
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List
+from janitor import fast_json
+from janitor.beefy_api import call_fee as lookup_call_fee, get_json
 
 ARBITRUM_CHAIN_ID = "42161"
 MIN_TVL = 10000  # $10k minimum
+DEFAULT_CLM_CALL_FEE = 0.005  # CLM vaults often have higher call fees; 0.5% when unlisted
 
 def main():
     print("🔍 Finding CLM vaults on Arbitrum...")
     
-    # Get CLM vaults
-    clm_response = requests.get("https://api.beefy.finance/cow-vaults")
-    clm_vaults = clm_response.json()
-    
-    # Get TVL data
-    tvl_response = requests.get("https://api.beefy.finance/tvl")
-    tvl_data = tvl_response.json()
+    # Get CLM vaults, TVL and fees concurrently
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        clm_vaults, tvl_data, fees_data = executor.map(
+            get_json, ('/cow-vaults', '/tvl', '/fees')
+        )
     arbitrum_tvl = tvl_data.get(ARBITRUM_CHAIN_ID, {})
     
-    # Get fees data
-    fees_response = requests.get("https://api.beefy.finance/fees")
-    fees_data = fees_response.json()
-    
     # Filter Arbitrum CLM vaults
     arb_clm = []
     
@@ -37,13 +33,7 @@ def main():
             
             if tvl > MIN_TVL:
                 # Get fees
-                vault_fees = fees_data.get(vault_id, {})
-                perf_fees = vault_fees.get('performance', {})
-                call_fee = perf_fees.get('call', 0)
-                
-                # CLM vaults often have higher call fees
-                if call_fee == 0:
-                    call_fee = 0.005  # 0.5% default for CLM
+                call_fee = lookup_call_fee(fees_data, vault_id) or DEFAULT_CLM_CALL_FEE
                 
                 arb_clm.append({
                     'id': vault_id,
@@ -74,8 +64,7 @@ def main():
             print(f"   Verify: https://arbiscan.io/address/{vault['address']}#code")
         
         # Save top CLM vaults
-        with open('clm_vaults.json', 'w') as f:
-            json.dump(arb_clm[:5], f, indent=2)
+        fast_json.dump_file(arb_clm[:5], 'clm_vaults.json')
         
         print(f"\n💾 Saved top {min(5, len(arb_clm))} CLM vaults to clm_vaults.json")
     else:
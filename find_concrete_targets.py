@@ -3,18 +3,22 @@
 Find concrete harvestable targets based on specific protocols
 """
 
-import requests
-import json
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from web3 import Web3
+from janitor import fast_json
+from janitor.beefy_api import SESSION, get_json
 
 def find_beefy_clm_vaults():
     """Find Beefy CLM (Concentrated Liquidity Manager) vaults on Arbitrum"""
     
     print("🔍 Finding Beefy CLM vaults on Arbitrum...")
     
-    # Get all vaults
-    response = requests.get("https://api.beefy.finance/vaults")
-    all_vaults = response.json()
+    # Get all vaults and the CLM-specific data concurrently
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        vaults_future = executor.submit(get_json, '/vaults')
+        clm_future = executor.submit(get_json, '/cow-vaults')
+    all_vaults = vaults_future.result()
     
     # Filter for Arbitrum CLM vaults
     clm_vaults = []
@@ -27,11 +31,12 @@ def find_beefy_clm_vaults():
     
     print(f"Found {len(clm_vaults)} CLM vaults on Arbitrum")
     
-    # Get CLM-specific data
-    clm_data = requests.get("https://api.beefy.finance/cow-vaults")
-    if clm_data.status_code == 200:
-        clm_info = clm_data.json()
+    # CLM-specific data is informational only
+    try:
+        clm_info = clm_future.result()
         print(f"Got CLM data for {len(clm_info)} vaults")
+    except Exception:
+        pass
     
     return clm_vaults
 
@@ -52,12 +57,13 @@ def find_reaper_vaults():
     
     # Reaper API endpoint (if available)
     try:
-        # Check if Reaper has an API
-        response = requests.get("https://api.reaper.farm/vaults", timeout=5)
+        # Check if Reaper has an API; the shared session retries transient
+        # 429/5xx responses and reuses its connection pool
+        response = SESSION.get("https://api.reaper.farm/vaults", timeout=(3.0, 5.0))
         if response.status_code == 200:
-            vaults = response.json()
+            vaults = fast_json.loads(response.content)
             print(f"Found {len(vaults)} Reaper vaults from API")
-    except:
+    except Exception:
         print("Reaper API not available, using known contracts")
     
     return reaper_arbitrum
@@ -110,9 +116,11 @@ def get_specific_beefy_strategies():
         }
     ]
     
-    for strat in working_strategies:
-        print(f"  • {strat['name']}: {strat['strategy'][:10]}...")
-        print(f"    {strat['description']}")
+    sys.stdout.write(''.join(
+        f"  • {strat['name']}: {strat['strategy'][:10]}...\n"
+        f"    {strat['description']}\n"
+        for strat in working_strategies
+    ))
     
     return working_strategies
 
@@ -177,8 +185,7 @@ def main():
         "balancer": balancer
     }
     
-    with open('concrete_targets.json', 'w') as f:
-        json.dump(results, f, indent=2)
+    fast_json.dump_file(results, 'concrete_targets.json')
     
     print("\n💾 Saved to concrete_targets.json")
 
@@ -4,36 +4,39 @@ Find real Beefy Finance vaults on Arbitrum with actual TVL and harvest fees
 Following Beefy's actual API structure
 """
 
-import json
-import requests
+import heapq
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List
 from datetime import datetime
+from janitor import fast_json
+from janitor.beefy_api import BEEFY_API, CACHE, SESSION, call_fee as lookup_call_fee, get_json, iter_items
 
 ARBITRUM_CHAIN_ID = "42161"
 MIN_TVL = 10000  # $10k minimum TVL
 DEFAULT_CALLER_FEE_BPS = 5  # 0.05% default caller fee per Beefy policy
+DEFAULT_CALLER_FEE = DEFAULT_CALLER_FEE_BPS / 10000
+CLM_HARVEST_LOOKUPS = 10  # Top vaults whose CLM harvest history is fetched
+
+# Vault addresses the CLM harvests endpoint 404'd for, skipped on later runs
+CLM_MISSES_KEY = 'clm_harvest_misses_arbitrum'
+CLM_MISSES_TTL = 86400
 
 def fetch_data():
     """Fetch all required data from Beefy APIs"""
     print("🔍 Fetching Beefy data...")
     
-    # Get all vaults
-    vaults_response = requests.get("https://api.beefy.finance/vaults")
-    vaults = vaults_response.json()
-    
-    # Get TVL data (keyed by chainId)
-    tvl_response = requests.get("https://api.beefy.finance/tvl")
-    tvl_data = tvl_response.json()
-    
-    # Get fees data
-    fees_response = requests.get("https://api.beefy.finance/fees")
-    fees_data = fees_response.json()
-    
-    # Get APY data
-    apy_response = requests.get("https://api.beefy.finance/apy")
-    apy_data = apy_response.json()
+    # TVL (keyed by chainId), fees and APY load in the background while
+    # the vault list streams in; only active Arbitrum vaults are kept
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        side_data = executor.map(get_json, ('/tvl', '/fees', '/apy'))
+        
+        vaults = [v for v in iter_items('/vaults')
+                  if v.get('chain') == 'arbitrum' and v.get('status') == 'active']
+        
+        tvl_data, fees_data, apy_data = side_data
     
-    print(f"✅ Fetched {len(vaults)} total vaults")
+    print(f"✅ Fetched {len(vaults)} active Arbitrum vaults")
     
     return vaults, tvl_data, fees_data, apy_data
 
@@ -45,8 +48,10 @@ def process_arbitrum_vaults(vaults, tvl_data, fees_data, apy_data):
     
     print(f"📊 Found {len(arbitrum_tvl)} Arbitrum vaults with TVL data")
     
-    # Filter active Arbitrum vaults
+    # Filter active Arbitrum vaults; only vaults past the TVL cut pay for
+    # the fee/APY lookups and the row dict
     arbitrum_vaults = []
+    tvl_of, apy_of = arbitrum_tvl.get, apy_data.get
     
     for vault in vaults:
         # Check if it's an active Arbitrum vault
@@ -56,25 +61,19 @@ def process_arbitrum_vaults(vaults, tvl_data, fees_data, apy_data):
         vault_id = vault['id']
         
         # Get TVL for this vault
-        tvl = arbitrum_tvl.get(vault_id, 0)
+        tvl = tvl_of(vault_id, 0)
         
         # Skip if TVL too low
         if tvl < MIN_TVL:
             continue
         
-        # Get fees for this vault
-        vault_fees = fees_data.get(vault_id, {})
-        performance_fees = vault_fees.get('performance', {})
-        
-        # Get caller fee (harvest fee)
+        # Get caller fee (harvest fee) for this vault
         # Beefy standard: caller gets 0.05% of performance fees
-        caller_fee = performance_fees.get('call', 0)
-        if caller_fee == 0:
-            # Use default policy of 0.05% if not specified
-            caller_fee = 0.0005  # 0.05%
+        # Use default policy of 0.05% if not specified
+        caller_fee = lookup_call_fee(fees_data, vault_id) or DEFAULT_CALLER_FEE
         
         # Get APY
-        apy = apy_data.get(vault_id, 0)
+        apy = apy_of(vault_id, 0)
         
         # Build vault data
         vault_data = {
@@ -93,19 +92,23 @@ def process_arbitrum_vaults(vaults, tvl_data, fees_data, apy_data):
         
         arbitrum_vaults.append(vault_data)
     
-    # Sort by TVL
-    arbitrum_vaults.sort(key=lambda x: x['tvl'], reverse=True)
-    
     return arbitrum_vaults
 
+def looks_like_clm(vault_id: str) -> bool:
+    """Only CLM vaults have harvest history on the cow-api"""
+    vault_id = vault_id.lower()
+    return 'clm' in vault_id or 'cow' in vault_id
+
 def fetch_clm_harvests(vault_address: str):
-    """Fetch CLM harvest history for a vault"""
+    """Fetch CLM harvest history for a vault, None if the API has no CLM by that address"""
     try:
-        url = f"https://api.beefy.finance/cow-api/clm/{ARBITRUM_CHAIN_ID}/{vault_address}/harvests"
-        response = requests.get(url, timeout=5)
+        url = f"{BEEFY_API}/cow-api/clm/{ARBITRUM_CHAIN_ID}/{vault_address}/harvests"
+        response = SESSION.get(url, timeout=5)
         if response.status_code == 200:
-            return response.json()
-    except:
+            return fast_json.loads(response.content)
+        if response.status_code == 404:
+            return None
+    except Exception:
         pass
     return []
 
@@ -121,42 +124,70 @@ def main():
     
     print(f"\n✅ Found {len(arbitrum_vaults)} Arbitrum vaults with TVL > ${MIN_TVL:,}")
     
+    # Only the top 20 by TVL are shown, so skip sorting the full list
+    ranked = heapq.nlargest(20, arbitrum_vaults, key=lambda x: x['tvl'])
+    
     # Show top vaults
     print("\n🎯 Top 20 Arbitrum Vaults by TVL:")
     print("-" * 100)
     print(f"{'#':<3} {'Name':<30} {'TVL':<15} {'APY':<8} {'Fee':<6} {'Type'}")
     print("-" * 100)
     
+    # Look up CLM harvest history for the top CLM vaults concurrently,
+    # skipping addresses the endpoint has already 404'd for
+    misses = set(CACHE.get(CLM_MISSES_KEY) or ())
+    lookups = [
+        vault['earnContractAddress'] for vault in ranked[:CLM_HARVEST_LOOKUPS]
+        if looks_like_clm(vault['id']) and vault['earnContractAddress'] not in misses
+    ]
+    clm_harvests = {}
+    if lookups:
+        with ThreadPoolExecutor(max_workers=len(lookups)) as executor:
+            clm_harvests = dict(zip(lookups, executor.map(fetch_clm_harvests, lookups)))
+    
+    new_misses = {address for address, harvests in clm_harvests.items() if address and harvests is None}
+    if new_misses:
+        CACHE.set(CLM_MISSES_KEY, sorted(misses | new_misses), CLM_MISSES_TTL)
+    
     top_vaults = []
-    for i, vault in enumerate(arbitrum_vaults[:20], 1):
+    rows = []
+    for i, vault in enumerate(ranked, 1):
         # Check if it's a CLM vault
         vault_type = "CLM" if "clm" in vault['id'].lower() else "Standard"
         
-        print(f"{i:<3} {vault['name'][:30]:<30} ${vault['tvl']:>13,.0f} {vault['apy']:>6.1f}% {vault['caller_fee_bps']:>4}bp {vault_type}")
+        rows.append(f"{i:<3} {vault['name'][:30]:<30} ${vault['tvl']:>13,.0f} {vault['apy']:>6.1f}% {vault['caller_fee_bps']:>4}bp {vault_type}")
         
-        # Try to get CLM harvest data for top 10
-        if i <= 10:
-            harvests = fetch_clm_harvests(vault['earnContractAddress'])
+        # Attach CLM harvest data for top 10
+        if i <= CLM_HARVEST_LOOKUPS:
+            harvests = clm_harvests.get(vault['earnContractAddress'])
             if harvests:
                 vault['harvest_count'] = len(harvests)
                 vault['last_harvest'] = harvests[0].get('timestamp') if harvests else None
             top_vaults.append(vault)
     
+    if rows:
+        sys.stdout.write('\n'.join(rows) + '\n')
+    
     # Show detailed info for top candidates
     print("\n📋 Top Harvest Candidates:")
     print("-" * 100)
     
+    out = []
     for i, vault in enumerate(top_vaults[:5], 1):
-        print(f"\n{i}. {vault['name']}")
-        print(f"   Contract: {vault['earnContractAddress']}")
-        print(f"   TVL: ${vault['tvl']:,.0f}")
-        print(f"   APY: {vault['apy']:.2f}%")
-        print(f"   Caller Fee: {vault['caller_fee_pct']:.3f}% ({vault['caller_fee_bps']} bps)")
-        print(f"   Token: {vault['token']}")
-        print(f"   Strategy: {vault['strategy'][:50]}...")
+        out.append(
+            f"\n{i}. {vault['name']}\n"
+            f"   Contract: {vault['earnContractAddress']}\n"
+            f"   TVL: ${vault['tvl']:,.0f}\n"
+            f"   APY: {vault['apy']:.2f}%\n"
+            f"   Caller Fee: {vault['caller_fee_pct']:.3f}% ({vault['caller_fee_bps']} bps)\n"
+            f"   Token: {vault['token']}\n"
+            f"   Strategy: {vault['strategy'][:50]}..."
+        )
         if vault.get('harvest_count'):
-            print(f"   Recent Harvests: {vault['harvest_count']} found")
-        print(f"   Verify: https://arbiscan.io/address/{vault['earnContractAddress']}#code")
+            out.append(f"   Recent Harvests: {vault['harvest_count']} found")
+        out.append(f"   Verify: https://arbiscan.io/address/{vault['earnContractAddress']}#code")
+    if out:
+        sys.stdout.write('\n'.join(out) + '\n')
     
     # Generate config for targets.json
     print("\n💾 Config for targets.json:")
@@ -191,21 +222,26 @@ def main():
         }
         configs.append(config)
     
+    # TVL and APY totals in one pass
+    total_tvl = total_apy = 0
+    for v in arbitrum_vaults:
+        total_tvl += v['tvl']
+        total_apy += v['apy']
+    
     # Save to file
     output = {
         "timestamp": datetime.now().isoformat(),
         "vaults": configs,
         "summary": {
             "total_vaults": len(arbitrum_vaults),
-            "total_tvl": sum(v['tvl'] for v in arbitrum_vaults),
-            "avg_apy": sum(v['apy'] for v in arbitrum_vaults) / len(arbitrum_vaults) if arbitrum_vaults else 0
+            "total_tvl": total_tvl,
+            "avg_apy": total_apy / len(arbitrum_vaults) if arbitrum_vaults else 0
         }
     }
     
-    with open('real_beefy_targets.json', 'w') as f:
-        json.dump(output, f, indent=2)
+    fast_json.dump_file(output, 'real_beefy_targets.json')
     
-    print(json.dumps(configs[0], indent=2))
+    print(fast_json.dumps(configs[0], indent=True).decode())
     
     print(f"\n✅ Saved {len(configs)} vault configs to real_beefy_targets.json")
     print("\n⚠️  Next Steps:")
@@ -3,49 +3,53 @@
 Get CLM vault strategy addresses for harvesting
 """
 
-import requests
-import json
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from janitor import fast_json
+from janitor.beefy_api import get_json
 
 def get_clm_strategies():
     """Get CLM vault strategies with their contract addresses"""
     
     print("🔍 Getting Beefy CLM vault strategies on Arbitrum...")
     
-    # Get CLM vaults
-    clm_response = requests.get("https://api.beefy.finance/cow-vaults")
-    clm_vaults = clm_response.json()
+    # Get CLM vaults and regular vault data (for strategy addresses) concurrently
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        clm_vaults, all_vaults = executor.map(get_json, ('/cow-vaults', '/vaults'))
     
-    # Get regular vault data for strategy addresses
-    vault_response = requests.get("https://api.beefy.finance/vaults")
-    all_vaults = vault_response.json()
+    # Active Arbitrum CLM vaults with the vault ID used in /vaults
+    arb_clms = [
+        (clm.get('vaultId') or clm.get('oracleId'), clm)
+        for clm in clm_vaults
+        if clm.get('chain') == 'arbitrum' and clm.get('status') == 'active'
+    ]
+    wanted_ids = {vault_id for vault_id, _ in arb_clms}
     
-    # Create mapping of vault ID to strategy
-    vault_strategies = {}
-    for vault in all_vaults:
-        if vault.get('strategy'):
-            vault_strategies[vault['id']] = vault['strategy']
+    # Map vault ID to strategy, only for the CLM vaults we care about
+    vault_strategies = {
+        vault['id']: vault['strategy']
+        for vault in all_vaults
+        if vault.get('strategy') and vault['id'] in wanted_ids
+    }
     
     # Find Arbitrum CLM vaults with strategies
     arbitrum_clm = []
-    for clm in clm_vaults:
-        if clm.get('chain') == 'arbitrum' and clm.get('status') == 'active':
-            vault_id = clm.get('vaultId') or clm.get('oracleId')
-            
-            # Look for strategy
-            strategy = vault_strategies.get(vault_id)
-            if not strategy and 'contractAddress' in clm:
-                strategy = clm['contractAddress']
-            
-            if strategy:
-                arbitrum_clm.append({
-                    'id': vault_id,
-                    'type': clm.get('type'),
-                    'strategy': strategy,
-                    'tvl': clm.get('tvl', 0),
-                    'apy': clm.get('apy', 0),
-                    'platform': clm.get('platformId', ''),
-                    'assets': clm.get('assets', [])
-                })
+    for vault_id, clm in arb_clms:
+        # Look for strategy
+        strategy = vault_strategies.get(vault_id)
+        if not strategy and 'contractAddress' in clm:
+            strategy = clm['contractAddress']
+        
+        if strategy:
+            arbitrum_clm.append({
+                'id': vault_id,
+                'type': clm.get('type'),
+                'strategy': strategy,
+                'tvl': clm.get('tvl', 0),
+                'apy': clm.get('apy', 0),
+                'platform': clm.get('platformId', ''),
+                'assets': clm.get('assets', [])
+            })
     
     # Sort by TVL
     arbitrum_clm.sort(key=lambda x: x.get('tvl', 0), reverse=True)
@@ -55,11 +59,13 @@ def get_clm_strategies():
     # Show top 10
     print("\nTop 10 CLM vaults by TVL:")
     print("-" * 60)
-    for i, vault in enumerate(arbitrum_clm[:10]):
-        print(f"\n{i+1}. {vault['id']}")
-        print(f"   Strategy: {vault.get('strategy', 'Unknown')}")
-        print(f"   TVL: ${vault['tvl']:,.0f}")
-        print(f"   Platform: {vault['platform']}")
+    sys.stdout.write(''.join(
+        f"\n{i+1}. {vault['id']}\n"
+        f"   Strategy: {vault.get('strategy', 'Unknown')}\n"
+        f"   TVL: ${vault['tvl']:,.0f}\n"
+        f"   Platform: {vault['platform']}\n"
+        for i, vault in enumerate(arbitrum_clm[:10])
+    ))
     
     return arbitrum_clm
 
@@ -123,8 +129,7 @@ if __name__ == "__main__":
             "recommended_targets": targets
         }
         
-        with open('clm_strategies.json', 'w') as f:
-            json.dump(results, f, indent=2)
+        fast_json.dump_file(results, 'clm_strategies.json')
         
         print("\n💾 Saved to clm_strategies.json")
     else:
@@ -0,0 +1,132 @@
+"""
+Beefy API helpers: stream vault lists instead of materialising multi-MB payloads,
+or reuse a recent copy from the disk cache
+"""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional
+import requests
+from urllib3.util.retry import Retry
+
+from janitor import fast_json
+from janitor.disk_cache import DiskCache
+from janitor.http_client import pooled_session
+
+ijson = None
+try:
+    import ijson
+except ImportError:
+    pass  # Falls back to parsing the whole body
+
+logger = logging.getLogger(__name__)
+
+BEEFY_API = "https://api.beefy.finance"
+BEEFY_TTL = 300  # Back-to-back discovery runs share one download
+VAULT_LIST_TTL = 3600  # Vault and strategy listings change far less often than TVL/APY
+
+# Per-path TTLs; anything unlisted (/tvl, /apy, /fees, ...) uses BEEFY_TTL
+PATH_TTLS = {
+    '/vaults': VAULT_LIST_TTL,
+    '/cow-vaults': VAULT_LIST_TTL,
+}
+
+CACHE = DiskCache()
+
+# Keep-alive pool for every Beefy call that doesn't bring its own session;
+# GETs are idempotent, so transient 5xx/429s are retried with backoff
+SESSION = pooled_session(4, 16, Retry(
+    total=3,
+    backoff_factor=0.3,
+    status_forcelist=[429, 502, 503, 504],
+    allowed_methods=['GET']
+))
+
+_EMPTY: Dict[str, Any] = {}
+
+@dataclass(frozen=True)
+class Snapshot:
+    """The four Beefy API payloads the vault finders join on"""
+    vaults: List[Dict[str, Any]]
+    tvl: Dict[str, Any]  # Keyed by chainId, then vault id
+    apy: Dict[str, float]
+    fees: Dict[str, Any]
+
+SNAPSHOT_PATHS = ('/vaults', '/tvl', '/apy', '/fees')
+
+def call_fee(fees: Dict[str, Any], vault_id: str) -> float:
+    """Harvest caller's cut of the performance fee from a /fees payload, 0 if unlisted"""
+    performance = (fees.get(vault_id) or _EMPTY).get('performance') or _EMPTY
+    return performance.get('call', 0)
+
+def _cache_key(path: str) -> str:
+    # '/cow-vaults' -> 'beefy_cow_vaults', the key the analyze_clm_* scripts already use
+    return 'beefy_' + path.strip('/').replace('-', '_').replace('/', '_')
+
+def ttl_for(path: str) -> float:
+    """Default disk-cache lifetime for a Beefy API path"""
+    return PATH_TTLS.get(path, BEEFY_TTL)
+
+def get_json(path: str, ttl: Optional[float] = None,
+             session: Optional[requests.Session] = None) -> Any:
+    """GET a Beefy API path (e.g. '/cow-vaults'), served from the disk cache while fresh"""
+    def fetch():
+        response = (session or SESSION).get(f"{BEEFY_API}{path}", timeout=30)
+        response.raise_for_status()
+        return fast_json.loads(response.content)
+    
+    return CACHE.get_or_fetch(_cache_key(path), ttl or ttl_for(path), fetch)
+
+def load_snapshot(ttl: Optional[float] = None,
+                  session: Optional[requests.Session] = None) -> Snapshot:
+    """Fetch /vaults, /tvl, /apy and /fees concurrently, each served from the disk cache while fresh"""
+    with ThreadPoolExecutor(max_workers=len(SNAPSHOT_PATHS)) as executor:
+        return Snapshot(*executor.map(lambda path: get_json(path, ttl, session), SNAPSHOT_PATHS))
+
+def iter_items(path: str, ttl: Optional[float] = None,
+               session: Optional[requests.Session] = None) -> Iterator[Dict[str, Any]]:
+    """Yield each element of a Beefy API array, from the disk cache while fresh
+
+    On a miss the body is parsed as it downloads, so callers start filtering
+    before the transfer ends and the raw bytes are never buffered whole. The
+    items are cached once the stream is fully consumed.
+    """
+    key = _cache_key(path)
+    cached = CACHE.get(key)
+    if cached is not None:
+        yield from cached
+        return
+    
+    items = []
+    try:
+        for item in iter_json_items(f"{BEEFY_API}{path}", session=session):
+            items.append(item)
+            yield item
+    except Exception as e:
+        stale = CACHE.get(key, allow_stale=True)
+        if items or stale is None:
+            raise
+        logger.warning(f"Refreshing {key} failed ({e}), serving last good copy")
+        yield from stale
+        return
+    
+    CACHE.set(key, items, ttl or ttl_for(path))
+
+def iter_json_items(url: str, session: Optional[requests.Session] = None,
+                    timeout: float = 30) -> Iterator[Dict[str, Any]]:
+    """Yield each element of a top-level JSON array, parsing incrementally when ijson is installed
+
+    Callers filter and project as they iterate, so the full list is never
+    held in memory at once.
+    """
+    http = session or SESSION
+    with http.get(url, stream=True, timeout=timeout) as response:
+        response.raise_for_status()
+        
+        if ijson is None:
+            yield from fast_json.loads(response.content)
+            return
+        
+        response.raw.decode_content = True  # Undo gzip/deflate transfer encoding
+        yield from ijson.items(response.raw, 'item', use_float=True)
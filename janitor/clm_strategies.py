@@ -0,0 +1,72 @@
+"""
+Beefy CLM vault list and vault -> strategy resolution on Arbitrum, cached on disk
+"""
+
+from typing import Dict, List, Optional
+import requests
+from web3 import Web3
+
+from janitor.beefy_api import CACHE, get_json
+from janitor.rpc import multicall_try_aggregate
+
+STRATEGY_SELECTOR = bytes(Web3.keccak(text="strategy()")[:4])
+# Getters tried, in order, on vaults without a strategy()
+MANAGER_SELECTORS = (
+    bytes(Web3.keccak(text="manager()")[:4]),
+    bytes(Web3.keccak(text="clmManager()")[:4]),
+)
+
+# Strategy pointers almost never change
+STRATEGY_MAP_KEY = 'strategy_map_arbitrum'
+STRATEGY_MAP_TTL = 86400
+
+def decode_address(return_data: bytes) -> Optional[str]:
+    """Checksummed address from a 32-byte return word, or None if empty/zero"""
+    if len(return_data) < 32 or not any(return_data[12:32]):
+        return None
+    return Web3.to_checksum_address(return_data[12:32])
+
+def fetch_cow_vaults(session: Optional[requests.Session] = None) -> List[Dict]:
+    """Beefy cow-vaults list, served from the disk cache while fresh"""
+    return get_json('/cow-vaults', session=session)
+
+def resolve_strategies(w3: Web3, vault_addrs: List[str]) -> Dict[str, Optional[str]]:
+    """Map vault -> strategy address, multicalling only vaults not in the disk cache
+
+    Vaults without a usable strategy() get one follow-up batch over the
+    manager getters. Only resolved addresses are cached, so a vault that
+    failed this run is retried next run instead of being pinned for a day.
+    """
+    strategy_map = CACHE.get(STRATEGY_MAP_KEY) or {}
+    fetched_at = CACHE.fetched_at(STRATEGY_MAP_KEY) if strategy_map else None
+
+    missing = [v for v in vault_addrs if not strategy_map.get(v)]
+    if not missing:
+        return strategy_map
+
+    # tryAggregate isolates reverts, so one vault without strategy() doesn't
+    # sink the whole batch
+    resolved = {
+        vault_addr: decode_address(return_data) if success else None
+        for vault_addr, (success, return_data) in zip(
+            missing,
+            multicall_try_aggregate(w3, [(v, STRATEGY_SELECTOR) for v in missing])
+        )
+    }
+
+    unresolved = [v for v in missing if not resolved[v]]
+    fallback = multicall_try_aggregate(w3, [
+        (v, selector) for v in unresolved for selector in MANAGER_SELECTORS
+    ])
+    for i, vault_addr in enumerate(unresolved):
+        answers = fallback[i * len(MANAGER_SELECTORS):(i + 1) * len(MANAGER_SELECTORS)]
+        resolved[vault_addr] = next(
+            (addr for success, return_data in answers
+             if success and (addr := decode_address(return_data))),
+            None
+        )
+
+    strategy_map.update((v, s) for v, s in resolved.items() if s)
+    CACHE.set(STRATEGY_MAP_KEY, strategy_map, STRATEGY_MAP_TTL, fetched_at=fetched_at)
+
+    return strategy_map
@@ -0,0 +1,82 @@
+"""
+Tiny JSON file cache with per-key TTLs for API responses and on-chain lookups
+"""
+
+import os
+import time
+import tempfile
+import logging
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from janitor import fast_json
+
+logger = logging.getLogger(__name__)
+
+class DiskCache:
+    """Stores each key as <cache_dir>/<key>.json = {fetched_at, ttl, payload}"""
+
+    def __init__(self, cache_dir: str = ".cache"):
+        self.cache_dir = Path(cache_dir)
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def _read(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._path(key), 'rb') as f:
+                return fast_json.loads(f.read())
+        except (OSError, ValueError):
+            return None
+
+    def get(self, key: str, allow_stale: bool = False) -> Optional[Any]:
+        """Return the cached payload if still within its TTL (or any age if allow_stale)"""
+        entry = self._read(key)
+        if entry is None:
+            return None
+        if allow_stale or entry['ttl'] is None or time.time() - entry['fetched_at'] < entry['ttl']:
+            return entry['payload']
+        return None
+
+    def set(self, key: str, payload: Any, ttl: Optional[float], fetched_at: Optional[float] = None):
+        """Write the payload atomically so concurrent readers never see a partial file (ttl=None never expires)"""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self._path(key)
+
+        # A temp file per write, so concurrent writers of one key don't share it
+        with tempfile.NamedTemporaryFile(dir=path.parent, prefix=f"{key}.", suffix='.tmp',
+                                         delete=False) as f:
+            try:
+                f.write(fast_json.dumps({
+                    'fetched_at': fetched_at or time.time(),
+                    'ttl': ttl,
+                    'payload': payload
+                }))
+            except Exception:
+                f.close()
+                os.unlink(f.name)
+                raise
+        os.replace(f.name, path)
+
+    def fetched_at(self, key: str) -> Optional[float]:
+        """When the key was last refreshed, regardless of freshness"""
+        entry = self._read(key)
+        return entry['fetched_at'] if entry else None
+
+    def get_or_fetch(self, key: str, ttl: float, fetch: Callable[[], Any]) -> Any:
+        """Serve fresh cached data, else fetch and store; fall back to stale data on failure"""
+        payload = self.get(key)
+        if payload is not None:
+            return payload
+
+        try:
+            payload = fetch()
+        except Exception as e:
+            stale = self.get(key, allow_stale=True)
+            if stale is None:
+                raise
+            logger.warning(f"Refreshing {key} failed ({e}), serving last good copy")
+            return stale
+
+        self.set(key, payload, ttl)
+        return payload
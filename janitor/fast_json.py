@@ -0,0 +1,29 @@
+"""
+JSON encode/decode through orjson when available, stdlib json otherwise
+"""
+
+import json
+from typing import Any, Union
+
+orjson = None
+try:
+    import orjson
+except ImportError:
+    pass  # Falls back to the stdlib json module
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Parse JSON; pass response.content (bytes) to skip the str decode"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def dumps(obj: Any, indent: bool = False) -> bytes:
+    """Serialize to UTF-8 bytes, optionally with the 2-space indent used for reports"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, indent=2 if indent else None).encode()
+
+def dump_file(obj: Any, path: str, indent: bool = True):
+    """Write obj to path as JSON (indented by default, matching json.dump(indent=2))"""
+    with open(path, 'wb') as f:
+        f.write(dumps(obj, indent))
@@ -0,0 +1,96 @@
+"""
+Shared HTTP session with retries and client-side rate limiting
+"""
+
+import time
+import logging
+import threading
+from typing import Any, Optional
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+# Alchemy's growth tier allows ~10,000 CU/s; an eth_call costs 26 CU
+DEFAULT_RATE_PER_SEC = 500
+
+# Substrings providers use for throughput errors that arrive with HTTP 200
+RATE_LIMIT_MARKERS = ('429', 'could not coalesce', 'rate limit', 'too many requests',
+                      'compute units')
+
+def mount_pool(session: requests.Session, pool_connections: int = 10, pool_maxsize: int = 50,
+               max_retries: Any = 0) -> requests.Session:
+    """Mount a keep-alive adapter with a larger pool than requests' default of 10"""
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=max_retries
+    )
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+def pooled_session(pool_connections: int = 10, pool_maxsize: int = 50,
+                   max_retries: Any = 0) -> requests.Session:
+    """Plain session that reuses TCP/TLS connections across calls"""
+    return mount_pool(requests.Session(), pool_connections, pool_maxsize, max_retries)
+
+class TokenBucket:
+    """Thread-safe token bucket limiting requests per second"""
+
+    def __init__(self, rate_per_sec: float, capacity: Optional[float] = None):
+        self.rate = rate_per_sec
+        self.capacity = capacity or rate_per_sec
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1.0):
+        """Block until the requested tokens are available"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return
+                wait = (tokens - self.tokens) / self.rate
+            time.sleep(wait)
+
+class RateLimitedClient(requests.Session):
+    """requests.Session with urllib3 retries and a client-side RPS cap
+
+    Pass it to Web3.HTTPProvider(url, session=client) so web3 calls share
+    the same throttle, retry policy and connection pool as raw HTTP calls.
+    """
+
+    def __init__(self, rate_per_sec: float = DEFAULT_RATE_PER_SEC, retries: int = 5,
+                 backoff_factor: float = 0.5, pool_connections: int = 10,
+                 pool_maxsize: int = 50):
+        super().__init__()
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=[429, 503],
+            allowed_methods=None  # JSON-RPC reads are POSTs but idempotent
+        )
+        mount_pool(self, pool_connections, pool_maxsize, retry)
+        self.bucket = TokenBucket(rate_per_sec)
+
+    def request(self, method, url, *args, **kwargs):
+        self.bucket.acquire()
+        return super().request(method, url, *args, **kwargs)
+
+def is_rate_limited(error: Any) -> bool:
+    """Check whether a JSON-RPC error / exception is a provider throughput error"""
+    if not error:
+        return False
+    text = str(error).lower()
+    return any(marker in text for marker in RATE_LIMIT_MARKERS)
+
+def backoff_delay(attempt: int) -> float:
+    """Exponential backoff delay in seconds, capped at 8s"""
+    return min(2 ** attempt * 0.25, 8)
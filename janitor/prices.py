@@ -0,0 +1,49 @@
+"""
+Spot USD prices from CoinGecko, cached on disk for a minute
+"""
+
+import logging
+from typing import Dict, Tuple
+
+from janitor.disk_cache import DiskCache
+from janitor.http_client import pooled_session
+
+logger = logging.getLogger(__name__)
+
+COINGECKO_PRICE_URL = "https://api.coingecko.com/api/v3/simple/price"
+SPOT_TTL = 60
+
+# Wrapped tokens share the price of the underlying asset
+COINGECKO_IDS = {
+    'ETH': 'ethereum',
+    'WETH': 'ethereum',
+    'BTC': 'bitcoin',
+    'WBTC': 'bitcoin',
+}
+
+# Last-resort values when CoinGecko is down and nothing is cached yet
+FALLBACK_USD = {'ethereum': 2500.0, 'bitcoin': 65000.0}
+
+SESSION = pooled_session()
+CACHE = DiskCache()
+
+def _fetch_prices(ids: Tuple[str, ...]) -> Dict[str, float]:
+    response = SESSION.get(
+        COINGECKO_PRICE_URL,
+        params={'ids': ','.join(ids), 'vs_currencies': 'usd'},
+        timeout=10
+    )
+    response.raise_for_status()
+    return {coin: data['usd'] for coin, data in response.json().items()}
+
+def get_spot_usd(symbols: Tuple[str, ...] = ('ETH', 'BTC')) -> Dict[str, float]:
+    """USD price per symbol from one CoinGecko call, memoized for SPOT_TTL seconds"""
+    ids = tuple(sorted({COINGECKO_IDS[s] for s in symbols}))
+    
+    try:
+        prices = CACHE.get_or_fetch(f"spot_usd_{'_'.join(ids)}", SPOT_TTL, lambda: _fetch_prices(ids))
+    except Exception as e:
+        logger.warning(f"CoinGecko price fetch failed ({e}), using fallback prices")
+        prices = FALLBACK_USD
+    
+    return {s: prices.get(COINGECKO_IDS[s], FALLBACK_USD[COINGECKO_IDS[s]]) for s in symbols}
@@ -4,34 +4,95 @@ Analyzes actual on-chain rewards vs estimates
 """
 
 import logging
-from typing import Dict, Any, List, Optional
+import threading
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple
 from web3 import Web3
 from web3.types import TxReceipt
 from decimal import Decimal
 import json
 
+from janitor.disk_cache import DiskCache
+from janitor.prices import get_spot_usd
+
 logger = logging.getLogger(__name__)
 
+ARBITRUM_CHAIN_ID = 42161
+
+# symbol/decimals are immutable, so on-chain lookups persist forever in .cache/token_meta.json
+TOKEN_META_CACHE = DiskCache()
+TOKEN_META_KEY = 'token_meta'
+
+# Common token addresses on Arbitrum, keyed (chain_id, lowercase address)
+SEED_TOKEN_META: Dict[Tuple[int, str], Tuple[str, int]] = {
+    (ARBITRUM_CHAIN_ID, '0x82af49447d8a07e3bd95bd0d56f35241523fbab1'): ('WETH', 18),
+    (ARBITRUM_CHAIN_ID, '0x2f2a2543b76a4166549f7aab2e75bef0aefc5b0f'): ('WBTC', 8),
+    (ARBITRUM_CHAIN_ID, '0xfd086bc7cd5c481dcc9c85ebe478a1c0b69fcbb9'): ('USDT', 6),
+    (ARBITRUM_CHAIN_ID, '0xff970a61a04b1ca14834a43f5de4533ebddb5cc8'): ('USDC', 6),
+    (ARBITRUM_CHAIN_ID, '0x912ce59144191c1204e64559fe8253a0e49e6548'): ('ARB', 18),
+    (ARBITRUM_CHAIN_ID, '0x6fe14d3cc2f7bddffba5cdb3bbe7467dd81ea101'): ('COTI', 18),
+    (ARBITRUM_CHAIN_ID, '0x6c2c06790b3e3e3c38e12ee22f8183b37a13ee55'): ('DPX', 18),
+    (ARBITRUM_CHAIN_ID, '0x539bde0d7dbd336b79148aa742883198bbf60342'): ('MAGIC', 18),
+}
+
+# ERC20 Transfer event signature
+TRANSFER_TOPIC = Web3.keccak(text="Transfer(address,address,uint256)").hex()
+
+ERC20_META_ABI = [
+    {"inputs":[],"name":"symbol","outputs":[{"type":"string"}],"type":"function","stateMutability":"view"},
+    {"inputs":[],"name":"decimals","outputs":[{"type":"uint8"}],"type":"function","stateMutability":"view"},
+    {"inputs":[],"name":"name","outputs":[{"type":"string"}],"type":"function","stateMutability":"view"}
+]
+
+# Web3 instance used to resolve metadata for each chain (set by ProfitTracker)
+_chain_w3: Dict[int, Web3] = {}
+_token_meta_lock = threading.Lock()
+
+def _token_meta_key(chain_id: int, token_address: str) -> str:
+    return f"{chain_id}:{token_address}"
+
+@lru_cache(maxsize=1024)
+def resolve_token_meta(chain_id: int, token_address: str) -> Tuple[str, int]:
+    """(symbol, decimals) for a lowercase token address; seed -> disk -> RPC, raises on RPC failure"""
+    seeded = SEED_TOKEN_META.get((chain_id, token_address))
+    if seeded:
+        return seeded
+    
+    key = _token_meta_key(chain_id, token_address)
+    with _token_meta_lock:
+        stored = (TOKEN_META_CACHE.get(TOKEN_META_KEY) or {}).get(key)
+    if stored:
+        return stored[0], stored[1]
+    
+    contract = _chain_w3[chain_id].eth.contract(
+        address=Web3.to_checksum_address(token_address),
+        abi=ERC20_META_ABI
+    )
+    symbol = contract.functions.symbol().call()
+    decimals = contract.functions.decimals().call()
+    
+    with _token_meta_lock:
+        stored = TOKEN_META_CACHE.get(TOKEN_META_KEY) or {}
+        stored[key] = [symbol, decimals]
+        TOKEN_META_CACHE.set(TOKEN_META_KEY, stored, ttl=None)
+    
+    return symbol, decimals
+
 class ProfitTracker:
     """Track and reconcile actual vs estimated profits"""
     
     def __init__(self, w3: Web3):
         self.w3 = w3
-        
-        # Common token addresses on Arbitrum
-        self.known_tokens = {
-            '0x82aF49447D8a07e3bd95BD0d56f35241523fBab1': {'symbol': 'WETH', 'decimals': 18},
-            '0x2f2a2543B76A4166549F7aaB2e75Bef0aefC5B0f': {'symbol': 'WBTC', 'decimals': 8},
-            '0xFd086bC7CD5C481DCC9C85ebE478A1C0b69FCbb9': {'symbol': 'USDT', 'decimals': 6},
-            '0xFF970A61A04b1cA14834A43f5dE4533eBDDB5CC8': {'symbol': 'USDC', 'decimals': 6},
-            '0x912CE59144191C1204E64559FE8253a0e49E6548': {'symbol': 'ARB', 'decimals': 18},
-            '0x6fE14d3CC2f7bDdffBa5CdB3BBE7467dd81ea101': {'symbol': 'COTI', 'decimals': 18},
-            '0x6C2C06790b3E3E3c38e12Ee22F8183b37a13EE55': {'symbol': 'DPX', 'decimals': 18},
-            '0x539bdE0d7Dbd336b79148AA742883198BBF60342': {'symbol': 'MAGIC', 'decimals': 18},
-        }
-        
-        # ERC20 Transfer event signature
-        self.transfer_topic = Web3.keccak(text="Transfer(address,address,uint256)").hex()
+        self._chain_id: Optional[int] = None
+        self.transfer_topic = TRANSFER_TOPIC
+    
+    @property
+    def chain_id(self) -> int:
+        """Chain id of the connected RPC, fetched once per tracker"""
+        if self._chain_id is None:
+            self._chain_id = self.w3.eth.chain_id
+            _chain_w3.setdefault(self._chain_id, self.w3)
+        return self._chain_id
         
     def analyze_harvest_receipt(
         self, 
@@ -89,10 +150,7 @@ class ProfitTracker:
                     amount_raw = int(log['data'], 16) if log['data'] else 0
                     
                     # Get token info
-                    token_info = self.known_tokens.get(token_address, {
-                        'symbol': f'Unknown({token_address[:8]}...)',
-                        'decimals': 18
-                    })
+                    token_info = self.get_token_info(token_address)
                     
                     # Convert to human-readable amount
                     amount = amount_raw / (10 ** token_info['decimals'])
@@ -123,34 +181,14 @@ class ProfitTracker:
         return result
     
     def get_token_info(self, token_address: str) -> Dict[str, Any]:
-        """Get token symbol and decimals from contract"""
+        """Get token symbol and decimals, cached per (chain_id, address) across calls and runs"""
         try:
-            # Load minimal ERC20 ABI
-            erc20_abi = [
-                {"inputs":[],"name":"symbol","outputs":[{"type":"string"}],"type":"function","stateMutability":"view"},
-                {"inputs":[],"name":"decimals","outputs":[{"type":"uint8"}],"type":"function","stateMutability":"view"},
-                {"inputs":[],"name":"name","outputs":[{"type":"string"}],"type":"function","stateMutability":"view"}
-            ]
-            
-            contract = self.w3.eth.contract(
-                address=Web3.to_checksum_address(token_address),
-                abi=erc20_abi
-            )
-            
-            symbol = contract.functions.symbol().call()
-            decimals = contract.functions.decimals().call()
-            
-            # Cache for future use
-            self.known_tokens[token_address] = {
-                'symbol': symbol,
-                'decimals': decimals
-            }
-            
+            symbol, decimals = resolve_token_meta(self.chain_id, token_address.lower())
             return {'symbol': symbol, 'decimals': decimals}
             
         except Exception as e:
             logger.warning(f"Could not get token info for {token_address}: {e}")
-            return {'symbol': 'Unknown', 'decimals': 18}
+            return {'symbol': f'Unknown({token_address[:8]}...)', 'decimals': 18}
     
     def estimate_usd_value(self, rewards: List[Dict], prices: Dict[str, float]) -> float:
         """
@@ -206,7 +244,7 @@ class ProfitReconciler:
         
         # Calculate actual gas cost in USD
         actual_gas_eth = actual_receipt['net_cost_eth']
-        eth_price = 2500.0  # TODO: Get from price feed
+        eth_price = get_spot_usd(('ETH',))['ETH']
         actual_gas_usd = actual_gas_eth * eth_price
         
         # Get actual rewards value
@@ -1,6 +1,10 @@
 import json
+import time
 import logging
-from typing import Optional, List, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, List, Dict, Any, Tuple, Union
+import requests
+from eth_abi import encode, decode
 from web3 import Web3
 from web3.providers import HTTPProvider
 # WebsocketProvider is optional, handle different web3 versions
@@ -13,15 +17,23 @@ except ImportError:
     except ImportError:
         pass  # WebSocket support not available
 from tenacity import retry, stop_after_attempt, wait_exponential
+from janitor import fast_json
+from janitor.http_client import is_rate_limited, backoff_delay, pooled_session
 
 logger = logging.getLogger(__name__)
 
+# Multicall3 is deployed at the same address on every chain we run on
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+_TRY_AGGREGATE = Web3.keccak(text="tryAggregate(bool,(address,bytes)[])")[:4]
+
 class RPCManager:
     """Manage Web3 connections with fallback support"""
     
     def __init__(self):
         self.connections: Dict[str, Web3] = {}
         self.current_rpc: Dict[str, int] = {}  # Track which RPC is active per chain
+        # One keep-alive pool shared by every HTTP provider
+        self.session = pooled_session()
     
     def get_w3(self, chain_name: str, rpc_urls: List[str]) -> Web3:
         """Get Web3 instance with automatic fallback"""
@@ -34,7 +46,8 @@ class RPCManager:
                 if (url.startswith('ws://') or url.startswith('wss://')) and WebsocketProvider:
                     provider = WebsocketProvider(url, websocket_timeout=20)
                 else:
-                    provider = HTTPProvider(url, request_kwargs={'timeout': 20})
+                    provider = HTTPProvider(url, request_kwargs={'timeout': 20},
+                                            session=self.session)
                 
                 w3 = Web3(provider)
                 if w3.is_connected():
@@ -94,4 +107,128 @@ def load_contract(w3: Web3, address: str, abi_path: str):
 def get_native_balance(w3: Web3, address: str) -> float:
     """Get native token balance in Ether"""
     balance_wei = w3.eth.get_balance(Web3.to_checksum_address(address))
-    return balance_wei / 1e18
\ No newline at end of file
+    return balance_wei / 1e18
+
+def _send_batch(rpc_url: str, chunk: List[tuple], http, max_attempts: int) -> List[Dict[str, Any]]:
+    """POST one JSON-RPC batch, re-sending throttled items with backoff"""
+    results: Dict[int, Dict[str, Any]] = {}
+    pending = list(range(len(chunk)))
+    
+    for attempt in range(max_attempts):
+        payload = [
+            {"jsonrpc": "2.0", "id": i, "method": chunk[i][0], "params": chunk[i][1]}
+            for i in pending
+        ]
+        
+        try:
+            response = http.post(rpc_url, json=payload, timeout=30)
+            data = fast_json.loads(response.content)
+            if isinstance(data, dict):
+                # Whole batch rejected (e.g. oversize or throttled)
+                data = [{'id': i, 'error': data.get('error', data)} for i in pending]
+            by_id = {item.get('id'): item for item in data}
+        except Exception as e:
+            logger.warning(f"Batch RPC request failed: {e}")
+            by_id = {i: {'error': {'message': str(e)}} for i in pending}
+        
+        throttled = []
+        for i in pending:
+            item = by_id.get(i, {'error': {'message': 'missing batch response'}})
+            if is_rate_limited(item.get('error')) and attempt < max_attempts - 1:
+                throttled.append(i)
+            else:
+                results[i] = item
+        
+        if not throttled:
+            break
+        time.sleep(backoff_delay(attempt))
+        pending = throttled
+    
+    return [results[i] for i in range(len(chunk))]
+
+def batch_rpc(rpc_url: str, calls: List[tuple], batch_size: int = 10,
+              session: Optional[requests.Session] = None,
+              max_attempts: int = 5, max_workers: int = 1) -> List[Dict[str, Any]]:
+    """Send (method, params) pairs as JSON-RPC batches, results in input order
+
+    Each entry is the raw response object, so callers check 'result' / 'error'.
+    Alchemy and most L2 nodes cap batch arrays at around 10 items. Items the
+    provider rejects for throughput are re-sent with exponential backoff.
+    With max_workers > 1 the batches are in flight concurrently.
+    """
+    http = session or requests
+    chunks = [calls[start:start + batch_size] for start in range(0, len(calls), batch_size)]
+    send = lambda chunk: _send_batch(rpc_url, chunk, http, max_attempts)
+    
+    if max_workers > 1 and len(chunks) > 1:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(chunks))) as executor:
+            batches = list(executor.map(send, chunks))
+    else:
+        batches = [send(chunk) for chunk in chunks]
+    
+    return [item for batch in batches for item in batch]
+
+def batch_eth_call(rpc_url: str, calls: List[Dict[str, Any]], batch_size: int = 10,
+                   session: Optional[requests.Session] = None,
+                   max_workers: int = 1) -> List[Dict[str, Any]]:
+    """eth_call each transaction dict at 'latest' via JSON-RPC batches"""
+    return batch_rpc(
+        rpc_url,
+        [("eth_call", [call, "latest"]) for call in calls],
+        batch_size=batch_size,
+        session=session,
+        max_workers=max_workers
+    )
+
+def eth_call_outcome(response: Dict[str, Any]) -> Tuple[str, bytes]:
+    """Classify a raw eth_call response as ('ok' | 'reverted' | 'failed', data)
+
+    Only execution reverts (code 3, or a message mentioning revert) count as
+    'reverted', with whatever revert data came back. Transport failures and
+    other node errors mean the call never ran and come back as 'failed'.
+    """
+    if 'result' in response:
+        return 'ok', Web3.to_bytes(hexstr=response['result'])
+    error = response.get('error') or {}
+    if error.get('code') == 3 or 'revert' in str(error.get('message', '')).lower():
+        data = error.get('data')
+        return 'reverted', Web3.to_bytes(hexstr=data) if isinstance(data, str) else b''
+    return 'failed', b''
+
+def multicall_try_aggregate(w3: Web3, calls: List[Tuple[str, Union[bytes, str]]],
+                            batch_size: int = 500,
+                            max_attempts: int = 5) -> List[Tuple[Optional[bool], bytes]]:
+    """Run (target, calldata) calls through Multicall3.tryAggregate
+
+    One eth_call per batch_size calls. Reverting sub-calls come back as
+    (False, revert_data) instead of failing the whole batch. Calls in a
+    batch whose eth_call itself failed come back as (None, b'').
+    Sub-calls in a batch run in order against shared state, so a batch of
+    state-changing simulations shouldn't hit the same contract twice.
+    """
+    results: List[Tuple[Optional[bool], bytes]] = []
+    
+    for start in range(0, len(calls), batch_size):
+        chunk = [
+            (Web3.to_checksum_address(target),
+             Web3.to_bytes(hexstr=data) if isinstance(data, str) else bytes(data))
+            for target, data in calls[start:start + batch_size]
+        ]
+        
+        data = _TRY_AGGREGATE + encode(['bool', '(address,bytes)[]'], [False, chunk])
+        
+        for attempt in range(max_attempts):
+            try:
+                raw = w3.eth.call({'to': MULTICALL3_ADDRESS, 'data': data})
+                (decoded,) = decode(['(bool,bytes)[]'], raw)
+                results.extend((success, bytes(ret)) for success, ret in decoded)
+                break
+            except Exception as e:
+                if is_rate_limited(e) and attempt < max_attempts - 1:
+                    time.sleep(backoff_delay(attempt))
+                    continue
+                logger.warning(f"Multicall batch of {len(chunk)} failed: {e}")
+                results.extend((None, b'') for _ in chunk)
+                break
+    
+    return results
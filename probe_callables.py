@@ -207,8 +207,8 @@ class CLMDiscovery:
             })
             
             if result and len(result) == 32:
-                strategy = "0x" + result.hex()[-40:]
-                if strategy != "0x" + "0"*40:
+                strategy = result[-20:]
+                if any(strategy):
                     return Web3.to_checksum_address(strategy)
         except:
             pass
@@ -222,8 +222,8 @@ class CLMDiscovery:
             })
             
             if result and len(result) == 32:
-                manager = "0x" + result.hex()[-40:]
-                if manager != "0x" + "0"*40:
+                manager = result[-20:]
+                if any(manager):
                     return Web3.to_checksum_address(manager)
         except:
             pass
@@ -6,10 +6,55 @@ Based on: call surface, incentive clarity, cadence, TVL, gas headroom, and role
 
 import json
 import time
+import requests
+from functools import lru_cache
 from web3 import Web3
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum
+from janitor.http_client import pooled_session
+from janitor.rpc import batch_eth_call
+
+@dataclass(frozen=True)
+class ChainConfig:
+    """Per-chain constants for discovery and scoring"""
+    rpc: str
+    gas_price_gwei: float
+
+CHAINS: Dict[str, ChainConfig] = {
+    'arbitrum': ChainConfig(
+        rpc="https://arb-mainnet.g.alchemy.com/v2/5mlDO-31svMGY53J2Urqv",
+        gas_price_gwei=0.1
+    ),
+    'base': ChainConfig(
+        rpc="https://base-mainnet.g.alchemy.com/v2/3AvaLFHobnzEIToydrEiN",
+        gas_price_gwei=0.05
+    ),
+}
+
+def chain_config(chain: str) -> ChainConfig:
+    """Look up a chain's constants, rejecting unsupported chains"""
+    if chain not in CHAINS:
+        raise ValueError(f"Unsupported chain: {chain}")
+    return CHAINS[chain]
+
+BOT_ADDRESS = "0x00823727Ec5800ae6f5068fABAEb39608dE8bf45"
+PROBE_CONCURRENCY = 4  # JSON-RPC batches of probes in flight at once
+
+# Callability probes in priority order, selectors derived from the signatures
+HARVEST_PROBES = [
+    (sig, bytes(Web3.keccak(text=sig)[:4]))
+    for sig in ("harvest()", "harvest(address)", "compound()", "tend()")
+]
+
+@lru_cache(maxsize=8)
+def probe_calldata(bot_address: str) -> Tuple[Tuple[str, bytes], ...]:
+    """(signature, calldata) per probe; harvest(address) gets the bot as fee recipient"""
+    recipient_arg = bytes(12) + bytes.fromhex(bot_address[2:])
+    return tuple(
+        (sig, selector + recipient_arg if sig == "harvest(address)" else selector)
+        for sig, selector in HARVEST_PROBES
+    )
 
 class ScoreLevel(Enum):
     EXCELLENT = (4, "✅✅✅✅", "Excellent - Add immediately")
@@ -69,7 +114,7 @@ class VaultScore:
         """Generate safe default config for targets.json"""
         # Determine parameters based on harvest function
         if self.harvest_function and "address" in self.harvest_function:
-            params = ["0x00823727Ec5800ae6f5068fABAEb39608dE8bf45"]  # Your bot address
+            params = [BOT_ADDRESS]  # Your bot address
         else:
             params = []
         
@@ -140,51 +185,47 @@ class VaultScore:
 class VaultEvaluator:
     """Evaluates vaults based on scoring rubric"""
     
-    def __init__(self, chain: str = "arbitrum"):
+    def __init__(self, chain: str = "arbitrum", session: Optional[requests.Session] = None):
         self.chain = chain
-        if chain == "arbitrum":
-            self.rpc = "https://arb-mainnet.g.alchemy.com/v2/5mlDO-31svMGY53J2Urqv"
-            self.gas_price_gwei = 0.1
-        elif chain == "base":
-            self.rpc = "https://base-mainnet.g.alchemy.com/v2/3AvaLFHobnzEIToydrEiN"
-            self.gas_price_gwei = 0.05
-        else:
-            raise ValueError(f"Unsupported chain: {chain}")
+        config = chain_config(chain)
+        self.rpc = config.rpc
+        self.gas_price_gwei = config.gas_price_gwei
         
-        self.w3 = Web3(Web3.HTTPProvider(self.rpc))
+        # Keep-alive pool sized for concurrent probes; callers can share theirs
+        self.session = session or pooled_session()
+        self.w3 = Web3(Web3.HTTPProvider(self.rpc, session=self.session))
     
-    def score_call_surface(self, address: str, bot_address: str = "0x00823727Ec5800ae6f5068fABAEb39608dE8bf45") -> Tuple[ScoreLevel, str]:
+    def score_call_surface(self, address: str, bot_address: str = BOT_ADDRESS) -> Tuple[ScoreLevel, str]:
         """Score based on whether harvest is publicly callable"""
-        # Test common harvest functions
-        test_functions = [
-            ("harvest()", "0x4641257d", []),
-            ("harvest(address)", "0x018ee9b7", [bot_address]),
-            ("compound()", "0xa0712d68", []),
-            ("tend()", "0x440368a4", []),
-        ]
+        return self.score_call_surfaces([address], bot_address)[0]
+    
+    def score_call_surfaces(self, addresses: List[str],
+                            bot_address: str = BOT_ADDRESS) -> List[Tuple[ScoreLevel, str]]:
+        """score_call_surface for many addresses, simulating every probe in JSON-RPC batches"""
+        probes = probe_calldata(bot_address)
+        responses = batch_eth_call(self.rpc, [
+            {'from': bot_address, 'to': address, 'data': '0x' + call_data.hex()}
+            for address in addresses for _, call_data in probes
+        ], session=self.session, max_workers=PROBE_CONCURRENCY)
         
-        for func_name, selector, params in test_functions:
-            try:
-                # Build call data
-                call_data = selector
-                for param in params:
-                    if isinstance(param, str) and param.startswith("0x"):
-                        call_data += param[2:].lower().zfill(64)
-                
-                # Try calling
-                self.w3.eth.call({
-                    'from': bot_address,
-                    'to': address,
-                    'data': call_data
-                })
+        return [
+            self._classify_probes(probes, responses[i * len(probes):(i + 1) * len(probes)])
+            for i in range(len(addresses))
+        ]
+    
+    @staticmethod
+    def _classify_probes(probes, responses: List[Dict]) -> Tuple[ScoreLevel, str]:
+        """First probe that succeeds wins; the first meaningful revert decides otherwise"""
+        for (func_name, _), response in zip(probes, responses):
+            if 'result' in response:
                 return ScoreLevel.EXCELLENT, func_name
-            except Exception as e:
-                error = str(e).lower()
-                if "onlykeeper" in error or "restricted" in error or "forbidden" in error:
-                    return ScoreLevel.FAIL, "Restricted to keeper role"
-                elif "revert" in error:
-                    # Function exists but reverted (might just be cooldown)
-                    return ScoreLevel.GOOD, f"{func_name} (reverted - check cooldown)"
+            
+            error = str(response.get('error', '')).lower()
+            if "onlykeeper" in error or "restricted" in error or "forbidden" in error:
+                return ScoreLevel.FAIL, "Restricted to keeper role"
+            elif "revert" in error:
+                # Function exists but reverted (might just be cooldown)
+                return ScoreLevel.GOOD, f"{func_name} (reverted - check cooldown)"
         
         return ScoreLevel.FAIL, "No callable harvest function found"
     
@@ -270,14 +311,15 @@ class VaultEvaluator:
                       protocol: str = "unknown",
                       harvest_frequency_hours: Optional[float] = None,
                       expected_reward_usd: float = 0.40,
-                      gas_estimate: int = 500000) -> VaultScore:
-        """Comprehensive vault evaluation"""
+                      gas_estimate: int = 500000,
+                      call_surface: Optional[Tuple[ScoreLevel, str]] = None) -> VaultScore:
+        """Comprehensive vault evaluation; pass call_surface if it was already probed"""
         
         # Calculate gas cost
         gas_cost_usd = (gas_estimate * self.gas_price_gwei * 1e-9) * 2500  # Assuming ETH = $2500
         
         # Score each dimension
-        call_score, harvest_func = self.score_call_surface(address)
+        call_score, harvest_func = call_surface or self.score_call_surface(address)
         
         score = VaultScore(
             vault_name=vault_name,
@@ -297,22 +339,34 @@ class VaultEvaluator:
         )
         
         return score
+    
+    def evaluate_many(self, vaults: List[Dict],
+                      call_surfaces: Optional[List[Tuple[ScoreLevel, str]]] = None) -> List[VaultScore]:
+        """evaluate_vault over many vaults, with every RPC probe batched up front
+
+        Each vault dict takes name, address and optionally tvl, protocol,
+        frequency_hours and expected_reward.
+        """
+        if call_surfaces is None:
+            call_surfaces = self.score_call_surfaces([vault['address'] for vault in vaults])
+        
+        return [
+            self.evaluate_vault(
+                vault_name=vault['name'],
+                address=vault['address'],
+                tvl_usd=vault.get('tvl', 0),
+                protocol=vault.get('protocol', 'unknown'),
+                harvest_frequency_hours=vault.get('frequency_hours'),
+                expected_reward_usd=vault.get('expected_reward', 0.40),
+                call_surface=call_surface
+            )
+            for vault, call_surface in zip(vaults, call_surfaces)
+        ]
 
 def evaluate_batch(vaults: List[Dict]) -> List[VaultScore]:
     """Evaluate multiple vaults and rank them"""
     evaluator = VaultEvaluator(vaults[0].get('chain', 'arbitrum'))
-    scores = []
-    
-    for vault in vaults:
-        score = evaluator.evaluate_vault(
-            vault_name=vault['name'],
-            address=vault['address'],
-            tvl_usd=vault.get('tvl', 0),
-            protocol=vault.get('protocol', 'unknown'),
-            harvest_frequency_hours=vault.get('frequency_hours'),
-            expected_reward_usd=vault.get('expected_reward', 0.40)
-        )
-        scores.append(score)
+    scores = evaluator.evaluate_many(vaults)
     
     # Sort by total score
     scores.sort(key=lambda x: x.total_score, reverse=True)